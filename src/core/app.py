@@ -11,6 +11,8 @@ import tempfile
 import tomllib
 from argparse import ArgumentParser
 from contextlib import contextmanager
+from functools import cache
+from importlib import metadata
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
 from typing import Generator, Optional
@@ -22,11 +24,12 @@ from src.core.orchestrator import Orchestrator
 from src.plugins.base import BackgroundVideoPlugin
 from src.plugins.registry import PluginRegistry
 from src.preset import YmlHandler
-from src.response import Gemini, QuotaExceededError
+from src.response import Gemini, QuotaExceededError, ResponseCache
 from src.utils.colors import Colors
 from src.utils.constants import (
     DEFAULT_CHANNEL_NAME,
     DEFAULT_FONT,
+    DEFAULT_GEMINI_CACHE_TTL,
     DEFAULT_PRESET_FILE,
     DEFAULT_SECRETS_FILE,
     DEFAULT_WHISPER_MODEL,
@@ -135,13 +138,21 @@ def new_workspace() -> Generator[str, None, None]:
         shutil.rmtree(temp_dir)
 
 
+@cache
 def get_version() -> str:
     """
-    Get version from pyproject.toml.
+    Get the installed package version, reading it once per process.
+
+    Falls back to pyproject.toml when running from an uninstalled checkout.
 
     Returns:
-        str: Version string from pyproject.toml.
+        str: Version string of the crank package.
     """
+    try:
+        return metadata.version("crank")
+    except metadata.PackageNotFoundError:
+        pass
+
     pyproject_path = Path(__file__).parents[2] / "pyproject.toml"
     try:
         with open(pyproject_path, "rb") as f:
@@ -188,6 +199,17 @@ class Core:
             )
         self.client: genai.Client = genai.Client(api_key=api_key)
 
+        # Off by default: every loop sends the same prompts and expects fresh scripts.
+        self.response_cache: Optional[ResponseCache] = None
+        cache_dir = self.preset.get("GEMINI_CACHE_DIR")
+        if cache_dir:
+            self.response_cache = ResponseCache(
+                Path(cache_dir).expanduser(),
+                ttl=float(
+                    self.preset.get("GEMINI_CACHE_TTL", DEFAULT_GEMINI_CACHE_TTL)
+                ),
+            )
+
         self.uploader: Optional[Uploader] = None
         if self.preset.get("UPLOAD") is not False:
             self.uploader = Uploader(
@@ -215,8 +237,13 @@ class Core:
         self.orchestrator: Orchestrator = Orchestrator(
             preset=self.preset,
             plugin=plugin,
-            gemini=Gemini(client=self.client, workspace=self.workspace),
-            editor=Editor(workspace=self.workspace),
+            gemini=Gemini(
+                client=self.client,
+                workspace=self.workspace,
+                cache=self.response_cache,
+            ),
+            # YouTube re-muxes uploads, so they skip the faststart rewrite pass.
+            editor=Editor(workspace=self.workspace, faststart=self.uploader is None),
             caption=Handler(
                 workspace=self.workspace,
                 model_size=self.preset.get("WHISPER_MODEL", DEFAULT_WHISPER_MODEL),
@@ -2,10 +2,21 @@
 
 import asyncio
 import datetime
+import inspect
 import logging
 import re
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from googleapiclient.http import ResumableUploadError
 
@@ -146,6 +157,7 @@ class Orchestrator:
             media_path=video_path_input,
             background_audio_path=background_audio_path,
             suppress_captions=pipeline_config.get("suppress_captions", False),
+            hardsub=pipeline_config.get("hardsub", True),
         )
         self.logger.debug(f"Video assembled: {video_path}")
 
@@ -192,14 +204,21 @@ class Orchestrator:
             pass
 
     async def _execute_with_loading(
-        self, message: str, task: Callable[..., T], *args: Any, **kwargs: Any
+        self,
+        message: str,
+        task: Callable[..., Union[T, Awaitable[T]]],
+        *args: Any,
+        **kwargs: Any,
     ) -> T:
         """
         Execute task with animated loading indicator.
 
+        Coroutine functions are awaited on the event loop; plain callables run
+        in the default executor so they do not block it.
+
         Args:
             message: Loading message to display.
-            task: Callable to execute.
+            task: Callable or coroutine function to execute.
             *args: Positional arguments for task.
             **kwargs: Keyword arguments for task.
 
@@ -209,15 +228,19 @@ class Orchestrator:
         stop_event = asyncio.Event()
         loading_task = asyncio.create_task(self._animate_loading(message, stop_event))
 
-        await asyncio.sleep(0.1)
+        # Yield once so the animation draws its first frame, without a fixed delay.
+        await asyncio.sleep(0)
 
         try:
-            loop = asyncio.get_running_loop()
+            if inspect.iscoroutinefunction(task):
+                result = await task(*args, **kwargs)
+            else:
+                loop = asyncio.get_running_loop()
 
-            def run_task() -> T:
-                return task(*args, **kwargs)
+                def run_task() -> T:
+                    return task(*args, **kwargs)
 
-            result = await loop.run_in_executor(None, run_task)
+                result = await loop.run_in_executor(None, run_task)
             await self._stop_loading_task(stop_event, loading_task)
             print(
                 f"\r{Colors.YELLOW}{message}{Colors.RESET} {Colors.GREEN}✓{Colors.RESET}   "
@@ -289,8 +312,8 @@ class Orchestrator:
             plugin_instruction=plugin_instruction,
         )
 
-        def get_gemini_response() -> str:
-            return self.gemini.get_response(response, DEFAULT_GEMINI_MODEL)
+        async def get_gemini_response() -> str:
+            return await self.gemini.aget_response(response, DEFAULT_GEMINI_MODEL)
 
         try:
             text: str = await self._execute_with_loading(
@@ -360,7 +383,7 @@ class Orchestrator:
 
         try:
             audio_path = await self._execute_with_loading(
-                "Generating voiceover", self.gemini.get_audio, transcript
+                "Generating voiceover", self.gemini.aget_audio, transcript
             )
             await self._print_success_output("Voiceover path", str(audio_path))
         except QuotaExceededError:
@@ -413,6 +436,7 @@ class Orchestrator:
             video_path_input,
             background_audio_path,
             pipeline_config.get("suppress_captions", False),
+            pipeline_config.get("hardsub", True),
         )
 
         await self._print_success_output("Output Path", str(video_path))
@@ -41,7 +41,7 @@ class BackgroundVideoPlugin(ABC):
             Union[Path, Dict[str, Any]]: Path to video file, OR a dict containing:
                 - video_path: Path to video file (Required)
                 - audio_path: Path to background audio file (Optional)
-                - config: Dict with keys like 'suppress_captions' (Optional)
+                - config: Dict with keys like 'suppress_captions' or 'hardsub' (Optional)
         """
         pass
 
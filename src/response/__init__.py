@@ -1,3 +1,9 @@
+from .cache import ResponseCache
 from .gemini import Gemini, QuotaExceededError, TTSUnavailableError
 
-__all__ = ["Gemini", "QuotaExceededError", "TTSUnavailableError"]
+__all__ = [
+    "Gemini",
+    "QuotaExceededError",
+    "ResponseCache",
+    "TTSUnavailableError",
+]
@@ -0,0 +1,93 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+from src.utils.constants import DEFAULT_GEMINI_CACHE_TTL
+
+
+class ResponseCache:
+    """On-disk cache of Gemini text responses keyed by model and prompt."""
+
+    def __init__(
+        self, directory: Union[str, Path], ttl: float = DEFAULT_GEMINI_CACHE_TTL
+    ) -> None:
+        """
+        Initialize the cache directory.
+
+        Args:
+            directory: Folder holding one JSON file per cached response.
+            ttl: Seconds an entry stays valid after it was written.
+        """
+        self.logger: logging.Logger = logging.getLogger(self.__class__.__name__)
+        self.directory: Path = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl: float = ttl
+
+    @staticmethod
+    def key(model: str, prompt: str) -> str:
+        """
+        Build the cache key for a model/prompt pair.
+
+        Args:
+            model: Full Gemini model name.
+            prompt: Prompt sent to the model.
+
+        Returns:
+            str: Hex SHA-256 digest identifying the request.
+        """
+        payload = json.dumps({"m": model, "p": prompt}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, model: str, prompt: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            model: Full Gemini model name.
+            prompt: Prompt sent to the model.
+
+        Returns:
+            Optional[str]: Cached text, or None on a miss or expired entry.
+        """
+        path = self.directory / f"{self.key(model, prompt)}.json"
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                return None
+            with path.open("r", encoding="utf-8") as f:
+                return json.load(f)["text"]
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def set(self, model: str, prompt: str, text: str) -> None:
+        """
+        Store a response, replacing any previous entry atomically.
+
+        Args:
+            model: Full Gemini model name.
+            prompt: Prompt sent to the model.
+            text: Response text to cache.
+        """
+        key = self.key(model, prompt)
+        path = self.directory / f"{key}.json"
+        tmp_name: Optional[str] = None
+        try:
+            # A unique temp file per write, so concurrent writers of the same
+            # key never share one before the rename.
+            fd, tmp_name = tempfile.mkstemp(
+                dir=self.directory, prefix=f"{key}.", suffix=".tmp"
+            )
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"model": model, "text": text}, f)
+            os.replace(tmp_name, path)
+        except OSError as e:
+            self.logger.warning(f"Failed to cache Gemini response: {e}")
+            if tmp_name is not None:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
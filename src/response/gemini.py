@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import random
 import re
@@ -8,8 +9,20 @@ from google.genai.errors import ClientError, ServerError
 import wave
 import os
 from pathlib import Path
-from typing import Union, Dict, Optional, List
+from typing import Union, Dict, Mapping, Optional, List
 from src.utils.constants import GEMINI_MODELS, DEFAULT_VOICE
+from .cache import ResponseCache
+
+# Retry hints found in 429 error messages, compiled once at import.
+RETRY_IN_PATTERN = re.compile(r"Please retry in ([\d.]+)s")
+RETRY_DELAY_PATTERN = re.compile(r"retryDelay[=:] ['\"]?(\d+)s")
+
+TTS_MODEL = "gemini-2.5-flash-preview-tts"
+
+# Exponential backoff between retries: 2s, 4s, 8s, ... capped, +/-20% jitter.
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 60.0
+BACKOFF_JITTER = 0.2
 
 
 class QuotaExceededError(RuntimeError):
@@ -27,48 +40,76 @@ class TTSUnavailableError(RuntimeError):
 class Gemini:
     """Handles Gemini API interactions for text and audio generation."""
 
-    def __init__(self, client: genai.Client, workspace: Union[str, Path]) -> None:
+    def __init__(
+        self,
+        client: genai.Client,
+        workspace: Union[str, Path],
+        cache: Optional[ResponseCache] = None,
+    ) -> None:
         """
         Initialize Gemini client.
 
         Args:
             client: Google Gemini API client.
             workspace: Directory for temporary files.
+            cache: Optional response cache; repeated prompts skip the API call.
         """
         self.logger: logging.Logger = logging.getLogger(self.__class__.__name__)
         self.client: genai.Client = client
         self.workspace: Union[str, Path] = workspace
-        self.models: Dict[str, str] = GEMINI_MODELS
+        self.models: Mapping[str, str] = GEMINI_MODELS
         self.voice: str = DEFAULT_VOICE
+        self.cache: Optional[ResponseCache] = cache
 
-    def _extract_retry_delay(self, error: Exception) -> float:
+    def _server_retry_hint(self, error: Exception) -> Optional[float]:
         """
-        Extract retry delay from 429 quota error response.
+        Read the retry delay the server suggested in a 429 error, if any.
 
         Args:
             error: Exception that may contain retry delay information.
 
         Returns:
-            float: Retry delay in seconds, or 60.0 as default.
+            Optional[float]: Suggested delay in seconds (at least 5s), or None.
         """
-        default_delay = 60.0
-
         if isinstance(error, ClientError):
             try:
                 error_str = str(error)
-                retry_delay_match = re.search(r"Please retry in ([\d.]+)s", error_str)
-                if retry_delay_match:
-                    delay = float(retry_delay_match.group(1))
-                    return max(delay, 5.0)
-
-                retry_delay_alt = re.search(r"retryDelay[=:] ['\"]?(\d+)s", error_str)
-                if retry_delay_alt:
-                    delay = float(retry_delay_alt.group(1))
-                    return max(delay, 5.0)
+                for pattern in (RETRY_IN_PATTERN, RETRY_DELAY_PATTERN):
+                    match = pattern.search(error_str)
+                    if match:
+                        return max(float(match.group(1)), 5.0)
             except (ValueError, AttributeError, IndexError):
                 pass
 
-        return default_delay
+        return None
+
+    def _extract_retry_delay(self, error: Exception) -> float:
+        """
+        Extract retry delay from 429 quota error response.
+
+        Args:
+            error: Exception that may contain retry delay information.
+
+        Returns:
+            float: Retry delay in seconds, or 60.0 as default.
+        """
+        hint = self._server_retry_hint(error)
+        return hint if hint is not None else 60.0
+
+    def _backoff_delay(self, attempt: int, minimum: float = 0.0) -> float:
+        """
+        Compute an exponential backoff delay with jitter.
+
+        Args:
+            attempt: 1-based attempt number that just failed.
+            minimum: Lower bound, e.g. a retry delay suggested by the server.
+
+        Returns:
+            float: Seconds to wait before the next attempt.
+        """
+        delay = min(BACKOFF_BASE_SECONDS * 2 ** (attempt - 1), BACKOFF_MAX_SECONDS)
+        delay *= random.uniform(1 - BACKOFF_JITTER, 1 + BACKOFF_JITTER)
+        return max(delay, minimum)
 
     def _is_quota_exceeded(self, error: Exception) -> bool:
         """
@@ -113,6 +154,88 @@ class Gemini:
             wf.writeframes(pcm)
         return path
 
+    def _audio_config(self) -> types.GenerateContentConfig:
+        """
+        Build the TTS request config for the configured voice.
+
+        Returns:
+            types.GenerateContentConfig: Config requesting audio output.
+        """
+        return types.GenerateContentConfig(
+            response_modalities=["AUDIO"],
+            speech_config=types.SpeechConfig(
+                voice_config=types.VoiceConfig(
+                    prebuilt_voice_config=types.PrebuiltVoiceConfig(
+                        voice_name=self.voice,
+                    )
+                )
+            ),
+        )
+
+    def _audio_from_response(self, response: types.GenerateContentResponse) -> str:
+        """
+        Validate a TTS response and save its audio.
+
+        Args:
+            response: Response returned by the TTS model.
+
+        Returns:
+            str: Path to saved WAV file.
+        """
+        if not response.candidates:
+            raise ValueError("No candidates returned from TTS model")
+        if not response.candidates[0].content.parts:
+            raise ValueError("No content parts returned in response")
+
+        data = response.candidates[0].content.parts[0].inline_data.data
+        if not data:
+            raise ValueError("No audio data found in response")
+
+        path = self._save_to_wav(data)
+        self.logger.info(f"Audio saved to {path}")
+        return path
+
+    def _audio_retry_wait(
+        self, error: Exception, attempt: int, max_retries: int
+    ) -> float:
+        """
+        Decide how a failed TTS attempt is handled.
+
+        Args:
+            error: Exception raised by the attempt.
+            attempt: 1-based attempt number that failed.
+            max_retries: Maximum number of attempts.
+
+        Returns:
+            float: Seconds to wait before retrying.
+
+        Raises:
+            QuotaExceededError: If the daily quota is exhausted.
+            TTSUnavailableError: If the error is not worth retrying.
+        """
+        if self._is_quota_exceeded(error):
+            hint = self._server_retry_hint(error)
+            if hint is None or attempt >= max_retries:
+                raise QuotaExceededError(
+                    "Daily API quota exceeded. Please wait 24 hours before trying again or check your billing plan."
+                )
+            wait = self._backoff_delay(attempt, hint)
+            self.logger.warning(
+                f"TTS rate limited on attempt {attempt}/{max_retries}. Retrying in {wait:.1f}s"
+            )
+            return wait
+
+        if self._is_retryable_server_error(error) and attempt < max_retries:
+            wait = self._backoff_delay(attempt)
+            self.logger.warning(
+                f"TTS server error on attempt {attempt}/{max_retries}: {error}. Retrying in {wait:.1f}s"
+            )
+            return wait
+
+        raise TTSUnavailableError(
+            "TTS service unavailable after retries. Please try again shortly."
+        ) from error
+
     def get_audio(self, transcript: str, max_retries: int = 3) -> str:
         """
         Generate speech audio from transcript using TTS.
@@ -130,55 +253,143 @@ class Gemini:
         if not transcript:
             raise ValueError("Transcript must be a non-empty string")
 
-        attempt = 0
-        while attempt < max_retries:
-            attempt += 1
+        for attempt in range(1, max_retries + 1):
             try:
                 response = self.client.models.generate_content(
-                    model="gemini-2.5-flash-preview-tts",
-                    contents=transcript,
-                    config=types.GenerateContentConfig(
-                        response_modalities=["AUDIO"],
-                        speech_config=types.SpeechConfig(
-                            voice_config=types.VoiceConfig(
-                                prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                                    voice_name=self.voice,
-                                )
-                            )
-                        ),
-                    ),
+                    model=TTS_MODEL, contents=transcript, config=self._audio_config()
                 )
+                return self._audio_from_response(response)
+            except Exception as e:
+                time.sleep(self._audio_retry_wait(e, attempt, max_retries))
 
-                if not response.candidates:
-                    raise ValueError("No candidates returned from TTS model")
-                if not response.candidates[0].content.parts:
-                    raise ValueError("No content parts returned in response")
+    async def aget_audio(self, transcript: str, max_retries: int = 3) -> str:
+        """
+        Generate speech audio like `get_audio`, using the native async client.
 
-                data = response.candidates[0].content.parts[0].inline_data.data
-                if not data:
-                    raise ValueError("No audio data found in response")
+        Args:
+            transcript: Text to convert to speech.
 
-                path = self._save_to_wav(data)
-                self.logger.info(f"Audio saved to {path}")
-                return path
+        Returns:
+            str: Path to generated audio file.
 
+        Raises:
+            QuotaExceededError: If daily quota is exceeded.
+            RuntimeError: If audio generation fails.
+        """
+        if not transcript:
+            raise ValueError("Transcript must be a non-empty string")
+
+        for attempt in range(1, max_retries + 1):
+            try:
+                response = await self.client.aio.models.generate_content(
+                    model=TTS_MODEL, contents=transcript, config=self._audio_config()
+                )
+                return self._audio_from_response(response)
             except Exception as e:
-                if self._is_quota_exceeded(e):
-                    raise QuotaExceededError(
-                        "Daily API quota exceeded. Please wait 24 hours before trying again or check your billing plan."
-                    )
+                await asyncio.sleep(self._audio_retry_wait(e, attempt, max_retries))
 
-                if self._is_retryable_server_error(e) and attempt < max_retries:
-                    wait = (2**attempt) + random.uniform(0, 1)
-                    self.logger.warning(
-                        f"TTS server error on attempt {attempt}/{max_retries}: {e}. Retrying in {wait:.1f}s"
-                    )
-                    time.sleep(wait)
-                    continue
+    def _model_priority(self, model: Union[str, float]) -> List[str]:
+        """
+        List the model to try first followed by its fallbacks.
 
-                raise TTSUnavailableError(
-                    "TTS service unavailable after retries. Please try again shortly."
-                ) from e
+        Args:
+            model: Model version (2.5 or 2.0).
+
+        Returns:
+            List[str]: Full model names in order, empty if the model is unknown.
+        """
+        current_model: Optional[str] = self.models.get(str(model))
+
+        if not current_model:
+            self.logger.error(f"Model '{model}' not found in self.models")
+            return []
+
+        models_priority: List[str] = list(self.models.values())
+        return models_priority[models_priority.index(current_model) :]
+
+    def _cached_response(self, model: str, query: str) -> Optional[str]:
+        """
+        Look a prompt up in the response cache.
+
+        Args:
+            model: Full Gemini model name.
+            query: Prompt string.
+
+        Returns:
+            Optional[str]: Cached text, or None on a miss or without a cache.
+        """
+        if self.cache is None:
+            return None
+
+        cached = self.cache.get(model, query)
+        if cached is not None:
+            self.logger.info(f"Gemini cache hit (model={model})")
+        return cached
+
+    def _response_text(
+        self,
+        response: types.GenerateContentResponse,
+        model: str,
+        query: str,
+        store: bool = True,
+    ) -> str:
+        """
+        Extract the text of a response and store it in the cache.
+
+        Args:
+            response: Response returned by the model.
+            model: Full Gemini model name.
+            query: Prompt string.
+            store: Write the text to the cache here; the async path passes
+                   False and writes it off the event loop instead.
+
+        Returns:
+            str: Response text.
+        """
+        text = getattr(response, "text", None)
+        if not text:
+            raise ValueError(f"No text in Gemini response: {response}")
+
+        self.logger.info(f"Gemini returned (model={model}): {text}")
+        if store and self.cache is not None:
+            self.cache.set(model, query, text)
+        return text
+
+    def _response_retry_wait(
+        self, error: Exception, attempt: int, max_retries: int, model: str
+    ) -> float:
+        """
+        Decide how a failed text generation attempt is handled.
+
+        Args:
+            error: Exception raised by the attempt.
+            attempt: 1-based attempt number that failed.
+            max_retries: Maximum number of attempts per model.
+            model: Full Gemini model name.
+
+        Returns:
+            float: Seconds to wait before retrying.
+
+        Raises:
+            QuotaExceededError: If the daily quota is exhausted.
+        """
+        if self._is_quota_exceeded(error):
+            hint = self._server_retry_hint(error)
+            if hint is None or attempt >= max_retries:
+                raise QuotaExceededError(
+                    "Daily API quota exceeded. Please wait 24 hours before trying again or check your billing plan."
+                )
+            wait = self._backoff_delay(attempt, hint)
+            self.logger.warning(
+                f"Rate limited on attempt {attempt}/{max_retries} with {model}. Retrying in {wait:.1f}s"
+            )
+            return wait
+
+        wait = self._backoff_delay(attempt)
+        self.logger.warning(
+            f"Attempt {attempt}/{max_retries} with {model} failed: {error}. Retrying in {wait:.1f}s"
+        )
+        return wait
 
     def get_response(
         self, query: str, model: Union[str, float], max_retries: int = 3
@@ -194,44 +405,80 @@ class Gemini:
         Returns:
             Optional[str]: Generated text or None if all attempts fail.
         """
-        current_model: Optional[str] = self.models.get(str(model))
-
-        if not current_model:
-            self.logger.error(f"Model '{model}' not found in self.models")
+        models_priority = self._model_priority(model)
+        if not models_priority:
             return None
 
-        models_priority: List[str] = list(self.models.values())
-        start_index: int = models_priority.index(current_model)
-
-        for model_index in range(start_index, len(models_priority)):
-            fallback_model = models_priority[model_index]
+        for fallback_model in models_priority:
+            cached = self._cached_response(fallback_model, query)
+            if cached is not None:
+                return cached
 
             for attempt in range(1, max_retries + 1):
                 try:
                     response = self.client.models.generate_content(
                         model=fallback_model, contents=query
                     )
+                    return self._response_text(response, fallback_model, query)
+                except Exception as e:
+                    time.sleep(
+                        self._response_retry_wait(
+                            e, attempt, max_retries, fallback_model
+                        )
+                    )
+
+            self.logger.warning(
+                f"Model {fallback_model} exhausted retries, trying fallback if available"
+            )
+
+        raise RuntimeError("All Gemini models failed after retries and fallbacks")
+
+    async def aget_response(
+        self, query: str, model: Union[str, float], max_retries: int = 3
+    ) -> Optional[str]:
+        """
+        Generate a text response like `get_response`, using the native async client.
+
+        Args:
+            query: Prompt string.
+            model: Model version (2.5 or 2.0).
+            max_retries: Maximum retry attempts per model.
 
-                    text = getattr(response, "text", None)
-                    if not text:
-                        raise ValueError(f"No text in Gemini response: {response}")
+        Returns:
+            Optional[str]: Generated text or None if the model is unknown.
+        """
+        models_priority = self._model_priority(model)
+        if not models_priority:
+            return None
 
-                    self.logger.info(
-                        f"Gemini returned (model={fallback_model}): {text}"
+        for fallback_model in models_priority:
+            if self.cache is not None:
+                # The cache reads from disk, so keep it off the event loop.
+                cached = await asyncio.to_thread(
+                    self._cached_response, fallback_model, query
+                )
+                if cached is not None:
+                    return cached
+
+            for attempt in range(1, max_retries + 1):
+                try:
+                    response = await self.client.aio.models.generate_content(
+                        model=fallback_model, contents=query
+                    )
+                    text = self._response_text(
+                        response, fallback_model, query, store=False
                     )
+                    if self.cache is not None:
+                        await asyncio.to_thread(
+                            self.cache.set, fallback_model, query, text
+                        )
                     return text
-
                 except Exception as e:
-                    if self._is_quota_exceeded(e):
-                        raise QuotaExceededError(
-                            "Daily API quota exceeded. Please wait 24 hours before trying again or check your billing plan."
+                    await asyncio.sleep(
+                        self._response_retry_wait(
+                            e, attempt, max_retries, fallback_model
                         )
-                    else:
-                        wait = 2**attempt + random.uniform(0, 1)
-                        self.logger.warning(
-                            f"Attempt {attempt}/{max_retries} with {fallback_model} failed: {e}. Retrying in {wait:.1f}s"
-                        )
-                        time.sleep(wait)
+                    )
 
             self.logger.warning(
                 f"Model {fallback_model} exhausted retries, trying fallback if available"
@@ -3,6 +3,47 @@ Application-wide constants.
 """
 
 from pathlib import Path
+from types import MappingProxyType
+
+__all__ = [
+    "SHORT_WIDTH",
+    "SHORT_HEIGHT",
+    "SHORT_ASPECT_RATIO",
+    "MAX_VIDEO_DURATION",
+    "MIN_VIDEO_DURATION",
+    "TARGET_VIDEO_DURATION",
+    "SUBTITLE_RESOLUTION_X",
+    "SUBTITLE_RESOLUTION_Y",
+    "SUBTITLE_FONT_SIZE",
+    "DEFAULT_FONT",
+    "RATE_LIMIT_COOLDOWN_HOURS",
+    "RATE_LIMIT_CHECK_INTERVAL_SECONDS",
+    "COOKIE_REFRESH_INTERVAL",
+    "DEFAULT_UPLOAD_DELAY",
+    "DEFAULT_SECRETS_FILE",
+    "DEFAULT_PRESET_FILE",
+    "DEFAULT_PROMPT_FILE",
+    "DEFAULT_LOG_FILE",
+    "TOKEN_FOLDER",
+    "DEFAULT_GEMINI_MODEL",
+    "GEMINI_MODELS",
+    "DEFAULT_VOICE",
+    "DEFAULT_GEMINI_CACHE_TTL",
+    "DEFAULT_WHISPER_MODEL",
+    "DEFAULT_CHANNEL_NAME",
+    "SCENE_THRESHOLD",
+    "MAX_SEGMENT_LENGTH",
+    "TEXT_DETECTION_THRESHOLD",
+    "MAX_SEARCH_RESULTS",
+    "MAX_DOWNLOAD_RETRIES",
+    "UPLOAD_CHUNK_SIZE",
+    "FFMPEG_PRESET",
+    "FFMPEG_CRF",
+    "FFMPEG_AUDIO_BITRATE",
+    "FFMPEG_AUDIO_CODEC",
+    "FFMPEG_VIDEO_CODEC",
+    "FFMPEG_PIX_FMT",
+]
 
 # Video dimensions for YouTube Shorts
 SHORT_WIDTH = 1080
@@ -39,11 +80,15 @@ TOKEN_FOLDER = Path(".tokens")
 
 # Gemini API
 DEFAULT_GEMINI_MODEL = "2.5"
-GEMINI_MODELS = {
-    "2.5": "gemini-2.5-flash",
-    "2.0": "gemini-2.0-flash",
-}
+# Read-only so callers holding a reference cannot alter the shared model table
+GEMINI_MODELS = MappingProxyType(
+    {
+        "2.5": "gemini-2.5-flash",
+        "2.0": "gemini-2.0-flash",
+    }
+)
 DEFAULT_VOICE = "Alnilam"
+DEFAULT_GEMINI_CACHE_TTL = 3600.0
 
 # Whisper model
 DEFAULT_WHISPER_MODEL = "small"
@@ -60,8 +105,11 @@ TEXT_DETECTION_THRESHOLD = 22.0
 MAX_SEARCH_RESULTS = 10
 MAX_DOWNLOAD_RETRIES = 4
 
+# YouTube resumable upload chunk size (in bytes)
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
 # FFmpeg settings
-FFMPEG_PRESET = "medium"
+FFMPEG_PRESET = "veryfast"
 FFMPEG_CRF = 23
 FFMPEG_AUDIO_BITRATE = "128k"
 FFMPEG_AUDIO_CODEC = "aac"
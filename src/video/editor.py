@@ -1,187 +1,912 @@
 import subprocess
-import json
+import io
 import logging
+import os
+import shutil
+import tempfile
+import threading
+import wave
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Union, Optional
+from typing import IO, Any, Deque, Dict, List, Optional, Tuple, Union
+
+from src.utils.constants import FFMPEG_PRESET, MAX_VIDEO_DURATION
+
+try:
+    import av
+
+    PYAV_AVAILABLE = True
+except ImportError:
+    PYAV_AVAILABLE = False
+
+# Encoder-specific output arguments; hardware encoders are tried in this order.
+ENCODER_ARGS: Dict[str, List[str]] = {
+    "h264_nvenc": [
+        "-preset",
+        "p4",
+        "-tune",
+        "hq",
+        "-rc",
+        "vbr",
+        "-cq",
+        "23",
+        "-b:v",
+        "0",
+    ],
+    "h264_vaapi": ["-qp", "23"],
+    "h264_qsv": ["-preset", "veryfast", "-global_quality", "23", "-pix_fmt", "nv12"],
+    "h264_videotoolbox": ["-b:v", "8M"],
+    "libx264": ["-crf", "23", "-profile:v", "high", "-level", "4.1"],
+}
+VAAPI_DEVICE = "/dev/dri/renderD128"
+
+# Shorter lookahead and fewer reference/B-frames than the preset defaults;
+# short clips gain little from the extra search.
+X264_TUNING = "rc-lookahead=10:ref=2:bframes=2"
+
+# Arguments shared by every FFmpeg assembly command.
+FFMPEG_GLOBAL_ARGS = ("-y", "-loglevel", "error", "-nostats", "-progress", "pipe:1")
+AUDIO_OUTPUT_ARGS = ("-c:a", "aac", "-b:a", "128k")
+RAMDISK_DIR = Path("/dev/shm")
+STDERR_TAIL_LINES = 200
+
+# Media with these extensions is a still image, looped for the clip duration.
+IMAGE_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg", ".webp"})
+STILL_IMAGE_FRAMERATE = 30
+
+VIDEO_FILTER_TEMPLATE = (
+    "[{input}:v]scale=1080:1920:force_original_aspect_ratio=decrease"
+    ":flags=fast_bilinear,pad=1080:1920:(ow-iw)/2:(oh-ih)/2:color=black,"
+    "format=yuv420p[bg{index}]"
+)
+SUBTITLE_FILTER_TEMPLATE = "{source}ass={ass}:shaping={shaping}[v{index}]"
+
+# Inputs may be paths on disk or in-memory data that is streamed to FFmpeg.
+MediaSource = Union[str, Path, bytes, IO[bytes]]
+
+
+@lru_cache(maxsize=None)
+def _binary(name: str) -> str:
+    """
+    Resolve an FFmpeg tool on PATH once, so later calls skip the PATH walk.
+
+    Args:
+        name: Executable name, e.g. "ffmpeg" or "ffprobe".
+
+    Returns:
+        str: Absolute path to the executable, or the bare name if not found.
+    """
+    return shutil.which(name) or name
+
+
+def _escape_ffmpeg_filter_path(path: Union[str, Path]) -> str:
+    """
+    Escape a path for use as a filter option inside a filtergraph.
+
+    FFmpeg parses the option value and then the filtergraph, so both levels
+    of special characters are escaped in turn.
+
+    Args:
+        path: File path to embed in the filtergraph.
+
+    Returns:
+        str: Escaped path.
+    """
+    value = str(path)
+    for specials in ("\\':", "\\'[],;"):
+        value = "".join(f"\\{char}" if char in specials else char for char in value)
+    return value
+
+
+def _subtitle_shaping(ass: Union[str, Path, bytes]) -> str:
+    """
+    Pick the libass text shaper for a subtitle file.
+
+    ASCII-only captions gain nothing from HarfBuzz, so libass can use its
+    cheaper simple shaper for every rendered frame.
+
+    Args:
+        ass: Path to the .ass file, or its contents.
+
+    Returns:
+        str: "simple" for ASCII-only subtitles, otherwise "auto".
+    """
+    data = ass if isinstance(ass, bytes) else Path(ass).read_bytes()
+    return "simple" if data.isascii() else "auto"
 
 
 class Editor:
     """Handles assembling video from media, audio, and subtitles using FFmpeg."""
 
-    def __init__(self, workspace: Union[str, Path]) -> None:
+    _detected_encoder: Optional[str] = None
+
+    def __init__(
+        self,
+        workspace: Union[str, Path],
+        encoder: Optional[str] = None,
+        use_ramdisk: bool = False,
+        cpu_threads: Optional[int] = None,
+        faststart: bool = True,
+        preset: str = FFMPEG_PRESET,
+        preflight: bool = False,
+    ) -> None:
         """
         Initialize editor with working directory.
 
         Args:
             workspace: Path to workspace folder for temporary files.
+            encoder: Force a specific H.264 encoder instead of auto-detecting one.
+            use_ramdisk: Keep intermediate and output files on tmpfs when available.
+                         The tmpfs folder, outputs included, is removed by
+                         `close()` or when the editor is garbage collected.
+            cpu_threads: Cap libx264 encoder threads, e.g. when running several
+                         editors in parallel. Defaults to using every core.
+            faststart: Relocate the moov atom to the front of the output. This
+                       costs a second pass over the file, so when False a
+                       fragmented MP4 is written in a single pass instead.
+            preset: libx264 speed preset, e.g. "superfast" to trade size for speed.
+            preflight: Before encoding, run the command once with a zero-length
+                       null output so bad inputs or filtergraphs fail fast.
         """
         self.logger: logging.Logger = logging.getLogger(self.__class__.__name__)
         self.workspace: Path = Path(workspace)
+        self._ramdisk_cleanup: Optional[weakref.finalize] = None
+        if use_ramdisk and RAMDISK_DIR.is_dir():
+            self.workspace = Path(tempfile.mkdtemp(prefix="crank-", dir=RAMDISK_DIR))
+            self._ramdisk_cleanup = weakref.finalize(
+                self, shutil.rmtree, self.workspace, ignore_errors=True
+            )
+        self.encoder: Optional[str] = encoder
+        self.cpu_threads: Optional[int] = cpu_threads
+        self.faststart: bool = faststart
+        self.preset: str = preset
+        self.preflight: bool = preflight
+        self.progress: Dict[str, str] = {}
+        self._probes: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+
+    def close(self) -> None:
+        """Remove the tmpfs workspace, if one was created."""
+        if self._ramdisk_cleanup is not None:
+            self._ramdisk_cleanup()
 
-    def _get_duration(self, file_path: Union[str, Path]) -> float:
+    def __enter__(self) -> "Editor":
+        """Use the editor as a context manager that calls `close()` on exit."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Remove the tmpfs workspace."""
+        self.close()
+
+    @classmethod
+    def _detect_encoder(cls) -> str:
+        """
+        Pick the fastest working H.264 encoder, probing FFmpeg only once per process.
+
+        An encoder being listed by FFmpeg does not mean the hardware is present,
+        so each candidate is confirmed with a tiny trial encode.
+
+        Returns:
+            str: Name of the encoder to use, falling back to libx264.
+        """
+        if cls._detected_encoder is not None:
+            return cls._detected_encoder
+
+        cls._detected_encoder = "libx264"
+        try:
+            listing = subprocess.check_output(
+                [_binary("ffmpeg"), "-hide_banner", "-encoders"],
+                stderr=subprocess.DEVNULL,
+            ).decode(errors="ignore")
+        except (OSError, subprocess.SubprocessError):
+            return cls._detected_encoder
+
+        for encoder in ENCODER_ARGS:
+            if encoder == "libx264" or encoder not in listing:
+                continue
+            trial = [_binary("ffmpeg"), "-hide_banner", "-loglevel", "error"]
+            if encoder == "h264_vaapi":
+                trial.extend(["-vaapi_device", VAAPI_DEVICE])
+            trial.extend(["-f", "lavfi", "-i", "color=black:size=256x256:duration=0.1"])
+            if encoder == "h264_vaapi":
+                trial.extend(["-vf", "format=nv12,hwupload"])
+            trial.extend(["-c:v", encoder, "-f", "null", "-"])
+            try:
+                result = subprocess.run(
+                    trial, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                )
+                if result.returncode == 0:
+                    cls._detected_encoder = encoder
+                    break
+            except (OSError, subprocess.SubprocessError):
+                continue
+
+        return cls._detected_encoder
+
+    def _x264_args(self, encoder: str) -> List[str]:
         """
-        Get duration of media file using FFprobe.
+        Build the libx264 preset, threading and rate-control tuning arguments.
+
+        The preset comes from `self.preset`, the thread count from
+        `self.cpu_threads` (all cores when unset) and the tuning from
+        `X264_TUNING`. Hardware encoders take their presets from
+        `ENCODER_ARGS` and get no extra args.
+
+        Args:
+            encoder: Selected video encoder.
+
+        Returns:
+            List[str]: FFmpeg arguments to append after the encoder options.
+        """
+        if encoder != "libx264":
+            return []
+
+        threads = str(self.cpu_threads) if self.cpu_threads else "auto"
+        return [
+            "-preset",
+            self.preset,
+            "-threads",
+            str(self.cpu_threads or 0),
+            "-x264-params",
+            f"threads={threads}:sliced-threads=1:lookahead-threads=2:{X264_TUNING}",
+        ]
+
+    @staticmethod
+    def _probe_key(
+        file_path: Union[str, Path], stat: os.stat_result
+    ) -> Tuple[str, int, int]:
+        """
+        Build the probe cache key, which changes whenever the file does.
 
         Args:
             file_path: Path to media/audio file.
+            stat: `os.stat` result for the path.
 
         Returns:
-            float: Duration in seconds.
+            Tuple[str, int, int]: Path, modification time in ns and size.
+        """
+        return (str(file_path), stat.st_mtime_ns, stat.st_size)
+
+    def _probe(
+        self,
+        file_path: Union[str, Path, bytes],
+        stat: Optional[os.stat_result] = None,
+    ) -> Dict[str, Any]:
+        """
+        Probe duration and first video stream of a media file.
+
+        PyAV reads the container in-process when installed; otherwise FFprobe
+        is spawned. Results are cached per (path, mtime, size), so probing the
+        same unchanged file again does no work.
+
+        Args:
+            file_path: Path to media/audio file, or its raw bytes.
+            stat: Already fetched `os.stat` result for the path, if any.
+
+        Returns:
+            Dict[str, Any]: Duration in seconds plus codec_name, width, height
+                            and pix_fmt of the video stream (None if absent).
         """
-        file_path = Path(file_path)
-        if not file_path.exists():
-            raise FileNotFoundError(
-                f"[{self.__class__.__name__}] File not found: {file_path}"
+        data: Optional[bytes] = None
+        key: Optional[Tuple[str, int, int]] = None
+        if isinstance(file_path, bytes):
+            data, target = file_path, "pipe:0"
+        else:
+            if stat is None:
+                try:
+                    stat = os.stat(file_path)
+                except FileNotFoundError:
+                    raise FileNotFoundError(
+                        f"[{self.__class__.__name__}] File not found: {file_path}"
+                    ) from None
+
+            key = self._probe_key(file_path, stat)
+            if key in self._probes:
+                return self._probes[key]
+            target = str(file_path)
+
+        if PYAV_AVAILABLE:
+            probe = self._probe_in_process(
+                io.BytesIO(data) if data is not None else target
             )
+        else:
+            probe = self._probe_ffprobe(target, data)
+        if key is not None:
+            self._probes[key] = probe
+        return probe
 
+    def _probe_in_process(self, target: Union[str, IO[bytes]]) -> Dict[str, Any]:
+        """
+        Probe a media file through PyAV, without spawning FFprobe.
+
+        Args:
+            target: Path to the file, or a file object holding its contents.
+
+        Returns:
+            Dict[str, Any]: Same fields as `_probe`.
+        """
+        try:
+            with av.open(target) as container:
+                if container.duration is None:
+                    raise ValueError("missing duration")
+                video = next(iter(container.streams.video), None)
+                codec = video.codec_context if video is not None else None
+                return {
+                    "duration": container.duration / av.time_base,
+                    "codec_name": codec.name if codec else None,
+                    "width": codec.width if codec else None,
+                    "height": codec.height if codec else None,
+                    "pix_fmt": codec.pix_fmt if codec else None,
+                }
+        except av.error.FFmpegError as e:
+            raise RuntimeError(f"[{self.__class__.__name__}] PyAV probe failed: {e}")
+        except ValueError:
+            raise RuntimeError(
+                f"[{self.__class__.__name__}] Failed to read duration of {target}"
+            )
+
+    def _probe_ffprobe(self, target: str, data: Optional[bytes]) -> Dict[str, Any]:
+        """
+        Probe a media file by running FFprobe.
+
+        Args:
+            target: Path to the file, or "pipe:0" when passing raw bytes.
+            data: Raw file contents to feed on stdin, if any.
+
+        Returns:
+            Dict[str, Any]: Same fields as `_probe`.
+        """
         cmd = [
-            "ffprobe",
+            _binary("ffprobe"),
             "-v",
             "error",
+            "-select_streams",
+            "v:0",
             "-show_entries",
-            "format=duration",
+            "format=duration:stream=codec_name,width,height,pix_fmt",
             "-of",
-            "json",
-            str(file_path),
+            "default=nw=1",
+            target,
         ]
 
         try:
-            output = subprocess.check_output(cmd, stderr=subprocess.STDOUT)
-            info = json.loads(output)
-            duration = float(info["format"]["duration"])
-            return duration
+            output = subprocess.check_output(cmd, stderr=subprocess.STDOUT, input=data)
+            fields = dict(
+                line.split("=", 1)
+                for line in output.decode(errors="ignore").splitlines()
+                if "=" in line
+            )
+            return {
+                "duration": float(fields["duration"]),
+                "codec_name": fields.get("codec_name"),
+                "width": int(fields["width"]) if "width" in fields else None,
+                "height": int(fields["height"]) if "height" in fields else None,
+                "pix_fmt": fields.get("pix_fmt"),
+            }
         except subprocess.CalledProcessError as e:
             raise RuntimeError(
                 f"[{self.__class__.__name__}] FFprobe failed: {getattr(e, 'output', str(e))}"
             )
-        except (KeyError, json.JSONDecodeError):
+        except (KeyError, ValueError):
             raise RuntimeError(
-                f"[{self.__class__.__name__}] Failed to parse FFprobe output for {file_path}"
+                f"[{self.__class__.__name__}] Failed to parse FFprobe output for {target}"
+            )
+
+    def _get_duration(
+        self,
+        file_path: Union[str, Path, bytes],
+        stat: Optional[os.stat_result] = None,
+    ) -> float:
+        """
+        Get duration of media file.
+
+        Args:
+            file_path: Path to media/audio file, or its raw bytes.
+            stat: Already fetched `os.stat` result for the path, if any.
+
+        Returns:
+            float: Duration in seconds.
+        """
+        wav_duration = self._wav_duration(file_path)
+        if wav_duration is not None:
+            return wav_duration
+        return self._probe(file_path, stat)["duration"]
+
+    def _prefetch_probes(self, sources: List[Any]) -> Dict[str, os.stat_result]:
+        """
+        Stat job inputs once and probe the uncached ones concurrently.
+
+        Each probe may spawn FFprobe, so running them side by side overlaps
+        the process startups; a pool is only started for two or more probes.
+        Missing files and probe failures are ignored here; they resurface
+        with the usual error when assembly reaches the file.
+
+        Args:
+            sources: Job inputs; only paths that need a probe are probed.
+
+        Returns:
+            Dict[str, os.stat_result]: `os.stat` result of every input path
+                                       found, for assembly to reuse.
+        """
+        skip = IMAGE_EXTENSIONS | {".wav"}
+        stats: Dict[str, os.stat_result] = {}
+        pending: List[Tuple[str, os.stat_result]] = []
+        for source in sources:
+            if not isinstance(source, (str, Path)) or str(source) in stats:
+                continue
+            path = str(source)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            stats[path] = stat
+            if (
+                Path(path).suffix.lower() not in skip
+                and self._probe_key(path, stat) not in self._probes
+            ):
+                pending.append((path, stat))
+
+        if len(pending) < 2:
+            return stats
+
+        def probe(item: Tuple[str, os.stat_result]) -> None:
+            try:
+                self._probe(*item)
+            except (FileNotFoundError, RuntimeError):
+                pass
+
+        with ThreadPoolExecutor(
+            max_workers=min(len(pending), os.cpu_count() or 1)
+        ) as executor:
+            executor.map(probe, pending)
+        return stats
+
+    @staticmethod
+    def _wav_duration(file_path: Union[str, Path, bytes]) -> Optional[float]:
+        """
+        Read the duration of a WAV file from its header.
+
+        Voiceovers are WAV files, so this spares a probe for the audio input.
+
+        Args:
+            file_path: Path to the audio file, or its raw bytes.
+
+        Returns:
+            Optional[float]: Duration in seconds, or None if not a readable WAV.
+        """
+        if isinstance(file_path, bytes):
+            if file_path[:4] != b"RIFF":
+                return None
+            source: Union[str, IO[bytes]] = io.BytesIO(file_path)
+        elif Path(file_path).suffix.lower() == ".wav":
+            source = str(file_path)
+        else:
+            return None
+
+        try:
+            with wave.open(source, "rb") as wav:
+                rate = wav.getframerate()
+                return wav.getnframes() / rate if rate else None
+        except (wave.Error, EOFError, OSError):
+            return None
+
+    @staticmethod
+    def _is_output_ready(probe: Dict[str, Any]) -> bool:
+        """
+        Check whether a probed video already matches the output format.
+
+        Args:
+            probe: Result of `_probe` for the media file.
+
+        Returns:
+            bool: True for 1080x1920 yuv420p H.264, which needs no scaling.
+        """
+        return (
+            probe["codec_name"] == "h264"
+            and (probe["width"], probe["height"]) == (1080, 1920)
+            and probe["pix_fmt"] == "yuv420p"
+        )
+
+    def _stream_input(self, path: Path, data: bytes) -> Optional[threading.Thread]:
+        """
+        Expose in-memory data to FFmpeg through a named pipe.
+
+        A background thread writes the data once FFmpeg opens the pipe, so the
+        bytes never touch the disk. Platforms without FIFOs get a plain file.
+
+        Args:
+            path: Location of the pipe inside the workspace.
+            data: Raw file contents.
+
+        Returns:
+            Optional[threading.Thread]: Writer thread, or None for a plain file.
+        """
+        path.unlink(missing_ok=True)
+        if not hasattr(os, "mkfifo"):
+            path.write_bytes(data)
+            return None
+
+        os.mkfifo(path)
+
+        def feed() -> None:
+            try:
+                with open(path, "wb") as pipe:
+                    pipe.write(data)
+            except BrokenPipeError:
+                pass
+
+        thread = threading.Thread(target=feed, daemon=True)
+        thread.start()
+        return thread
+
+    def _close_streams(
+        self, feeders: List[Tuple[Path, Optional[threading.Thread]]]
+    ) -> None:
+        """
+        Release writer threads still blocked on a pipe and remove the inputs.
+
+        Args:
+            feeders: (path, writer thread) pairs; the thread is None for
+                     inputs written as plain files.
+        """
+        for path, thread in feeders:
+            if thread is not None:
+                if thread.is_alive():
+                    try:
+                        os.close(os.open(path, os.O_RDONLY | os.O_NONBLOCK))
+                    except OSError:
+                        pass
+                thread.join(timeout=1)
+            path.unlink(missing_ok=True)
+
+    def _drain_stderr(self, stream: IO[bytes], tail: Deque[bytes]) -> None:
+        """
+        Forward FFmpeg stderr to the debug log, keeping only the last lines.
+
+        Lines are only decoded when debug logging is enabled; otherwise the
+        raw bytes are kept for the error message and nothing else.
+
+        Args:
+            stream: FFmpeg stderr pipe.
+            tail: Bounded buffer receiving the most recent lines.
+        """
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        with stream:
+            for line in stream:
+                tail.append(line)
+                if debug:
+                    self.logger.debug(line.decode(errors="replace").rstrip())
+
+    def _read_progress(self, stream: IO[bytes]) -> None:
+        """
+        Parse FFmpeg `-progress` key=value blocks into `self.progress`.
+
+        Args:
+            stream: FFmpeg stdout pipe carrying the progress report.
+        """
+        with stream:
+            for line in stream:
+                key, sep, value = line.decode(errors="replace").strip().partition("=")
+                if not sep:
+                    continue
+                self.progress[key] = value
+                if key == "progress":
+                    self.logger.debug(
+                        f"Encoding: frame={self.progress.get('frame')} "
+                        f"time={self.progress.get('out_time')} "
+                        f"speed={self.progress.get('speed')}"
+                    )
+
+    def _run_ffmpeg(self, cmd: List[str]) -> None:
+        """
+        Run an FFmpeg command without buffering its whole stderr in memory.
+
+        Progress reported on stdout (`-progress pipe:1`) is parsed as it
+        arrives instead of scraping the log output.
+
+        Args:
+            cmd: Full FFmpeg command line.
+
+        Raises:
+            subprocess.CalledProcessError: If FFmpeg exits non-zero; `stderr`
+                holds the tail of its output.
+        """
+        self.progress = {}
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        tail: Deque[bytes] = deque(maxlen=STDERR_TAIL_LINES)
+        readers = [
+            threading.Thread(
+                target=self._drain_stderr, args=(process.stderr, tail), daemon=True
+            ),
+            threading.Thread(
+                target=self._read_progress, args=(process.stdout,), daemon=True
+            ),
+        ]
+        for reader in readers:
+            reader.start()
+        returncode = process.wait()
+        for reader in readers:
+            reader.join()
+
+        if returncode != 0:
+            raise subprocess.CalledProcessError(
+                returncode, cmd, stderr=b"".join(tail).decode(errors="replace")
             )
 
     def assemble(
         self,
-        ass_path: Union[str, Path],
-        audio_path: Union[str, Path],
+        ass_path: MediaSource,
+        audio_path: MediaSource,
         media_path: Union[str, Path],
         background_audio_path: Optional[Union[str, Path]] = None,
         suppress_captions: bool = False,
+        hardsub: bool = True,
     ) -> Path:
         """
         Assemble video from media, audio, and subtitle file.
 
         Args:
-            ass_path: Path to .ass subtitle file.
-            audio_path: Path to audio file.
+            ass_path: Path to .ass subtitle file, or its contents as bytes/file object.
+            audio_path: Path to audio file, or its contents as bytes/file object.
             media_path: Path to video/image file.
+            background_audio_path: Optional background track mixed under the voiceover.
+            suppress_captions: Skip burning in the subtitles when True.
+            hardsub: Burn the subtitles into the frames. When False they are
+                     muxed as a mov_text track, so ready media is stream-copied.
 
         Returns:
             Path: Path to generated output video.
         """
-        ass_path, audio_path, media_path = (
-            Path(ass_path),
-            Path(audio_path),
-            Path(media_path),
+        return self.assemble_many(
+            [
+                {
+                    "ass_path": ass_path,
+                    "audio_path": audio_path,
+                    "media_path": media_path,
+                    "background_audio_path": background_audio_path,
+                    "suppress_captions": suppress_captions,
+                    "hardsub": hardsub,
+                }
+            ]
+        )[0]
+
+    def assemble_many(self, jobs: List[Dict[str, Any]]) -> List[Path]:
+        """
+        Assemble several videos with a single FFmpeg invocation.
+
+        Every job gets its own input group, filter chain and output file, so
+        FFmpeg startup and codec initialization are paid once for the batch.
+
+        Args:
+            jobs: List of dicts with the keyword arguments of `assemble`
+                  (ass_path, audio_path, media_path and optionally
+                  background_audio_path, suppress_captions, hardsub,
+                  output_path).
+
+        Returns:
+            List[Path]: Paths to generated output videos, in job order.
+        """
+        if not jobs:
+            return []
+
+        encoder = self.encoder or self._detect_encoder()
+        self.logger.debug(f"Using video encoder: {encoder}")
+        known_stats = self._prefetch_probes(
+            [job[key] for job in jobs for key in ("audio_path", "media_path")]
         )
-        output_path = Path(self.workspace / "output.mp4")
-
-        for file_path, desc in [
-            (ass_path, "ASS subtitle"),
-            (audio_path, "Audio"),
-            (media_path, "Media"),
-        ]:
-            if not file_path.exists():
-                raise FileNotFoundError(
-                    f"[{self.__class__.__name__}] {desc} file not found: {file_path}\n"
-                    f"Please ensure all required files (subtitle, audio, media) are generated/available."
-                )
 
-        audio_duration = self._get_duration(audio_path)
-        media_duration = self._get_duration(media_path)
-        final_duration = min(audio_duration, media_duration, 60.0)
+        movflags = "+faststart" if self.faststart else "+frag_keyframe+empty_moov"
 
-        if final_duration <= 0:
-            raise ValueError(
-                f"[{self.__class__.__name__}] Calculated video duration is not positive "
-                f"(audio: {audio_duration:.2f}s, media: {media_duration:.2f}s). "
-                f"Please check that both audio and video files are valid."
+        cmd = [_binary("ffmpeg"), *FFMPEG_GLOBAL_ARGS]
+        if encoder == "h264_vaapi":
+            cmd.extend(["-vaapi_device", VAAPI_DEVICE])
+        filter_parts: List[str] = []
+        output_args: List[str] = []
+        preflight_args: List[str] = []
+        output_paths: List[Path] = []
+        streams: List[Tuple[Path, bytes]] = []
+        # libass seeks to size the script, so burned-in subtitles cannot be
+        # pipes; they are written to the workspace (tmpfs with use_ramdisk).
+        subtitle_files: List[Tuple[Path, bytes]] = []
+        feeders: List[Tuple[Path, Optional[threading.Thread]]] = []
+        input_count = 0
+
+        for index, job in enumerate(jobs):
+            ass_path, audio_path, media_path = (
+                job["ass_path"],
+                job["audio_path"],
+                Path(job["media_path"]),
             )
+            if hasattr(ass_path, "read"):
+                ass_path = ass_path.read()
+            if hasattr(audio_path, "read"):
+                audio_path = audio_path.read()
+            background_audio_path = job.get("background_audio_path")
+            if job.get("output_path"):
+                output_path = Path(job["output_path"])
+            elif len(jobs) == 1:
+                output_path = Path(self.workspace / "output.mp4")
+            else:
+                output_path = Path(self.workspace / f"output_{index}.mp4")
 
-        input_count = 2
-        cmd = [
-            "ffmpeg",
-            "-y",
-            "-i",
-            str(media_path),
-            "-i",
-            str(audio_path),
-        ]
+            stats: Dict[str, os.stat_result] = {}
+            for file_path, desc in [
+                (ass_path, "ASS subtitle"),
+                (audio_path, "Audio"),
+                (media_path, "Media"),
+            ]:
+                if isinstance(file_path, bytes):
+                    continue
+                if str(file_path) in known_stats:
+                    stats[desc] = known_stats[str(file_path)]
+                    continue
+                try:
+                    stats[desc] = os.stat(file_path)
+                except FileNotFoundError:
+                    raise FileNotFoundError(
+                        f"[{self.__class__.__name__}] {desc} file not found: {file_path}\n"
+                        f"Please ensure all required files (subtitle, audio, media) are generated/available."
+                    ) from None
 
-        if background_audio_path:
-            cmd.extend(["-i", str(background_audio_path)])
-            audio_filter = (
-                f"[1:a][2:a]amix=inputs=2:duration=first:dropout_transition=2[a]"
+            audio_duration = self._get_duration(audio_path, stats.get("Audio"))
+            is_image = media_path.suffix.lower() in IMAGE_EXTENSIONS
+            if is_image:
+                # A looped image lasts as long as the audio needs it to.
+                media_duration = float("inf")
+            else:
+                media_duration = self._get_duration(media_path, stats["Media"])
+            final_duration = min(audio_duration, media_duration, MAX_VIDEO_DURATION)
+
+            if final_duration <= 0:
+                raise ValueError(
+                    f"[{self.__class__.__name__}] Calculated video duration is not positive "
+                    f"(audio: {audio_duration:.2f}s, media: {media_duration:.2f}s). "
+                    f"Please check that both audio and video files are valid."
+                )
+
+            suppress_captions = job.get("suppress_captions", False)
+            is_ready = not is_image and self._is_output_ready(
+                self._probe(media_path, stats["Media"])
             )
-            audio_map = "[a]"
-            input_count += 1
-        else:
-            audio_filter = ""
-            audio_map = "1:a:0"
-            
-        video_chain = (
-            f"[0:v]scale=1080:1920:force_original_aspect_ratio=decrease,"
-            f"pad=1080:1920:(ow-iw)/2:(oh-ih)/2:color=black[bg]"
-        )
-        
-        filter_parts = [video_chain]
-        last_label = "[bg]"
+            burn_captions = job.get("hardsub", True) and not suppress_captions
+            soft_captions = not (burn_captions or suppress_captions)
+            video_codec = encoder
+            # A stream copy bypasses the encoder and its hwupload filter, so it
+            # is safe for every encoder, VAAPI included.
+            if is_ready and not burn_captions:
+                video_codec = "copy"
 
-        if not suppress_captions:
-            escaped_ass_path = str(ass_path).replace(":", "\\:").replace("'", "\\'")
-            filter_parts.append(f"{last_label}ass='{escaped_ass_path}'[v]")
-            last_label = "[v]"
+            # Read before in-memory subtitles are swapped for a path.
+            shaping = _subtitle_shaping(ass_path) if burn_captions else "auto"
+            if isinstance(ass_path, bytes):
+                pending = subtitle_files if burn_captions else streams
+                pending.append((self.workspace / f"captions_{index}.ass", ass_path))
+                ass_path = pending[-1][0]
+            if isinstance(audio_path, bytes):
+                streams.append((self.workspace / f"audio_{index}", audio_path))
+                audio_path = streams[-1][0]
+            ass_path, audio_path = Path(ass_path), Path(audio_path)
 
-        filter_complex = ";".join(filter_parts)
-        if audio_filter:
-            filter_complex += f";{audio_filter}"
+            media_input, voice_input = input_count, input_count + 1
+            if is_image:
+                cmd.extend(["-loop", "1", "-framerate", str(STILL_IMAGE_FRAMERATE)])
+            elif video_codec == "h264_nvenc":
+                # Decode on the GPU too; frames come back to system memory
+                # because the scale and ass filters run on the CPU.
+                cmd.extend(["-hwaccel", "cuda"])
+            cmd.extend(["-i", str(media_path), "-i", str(audio_path)])
+            input_count += 2
 
-        cmd.extend(
-            [
-                "-filter_complex",
-                filter_complex,
-                "-map",
-                last_label,
+            if background_audio_path:
+                cmd.extend(["-i", str(background_audio_path)])
+                audio_filter = (
+                    f"[{voice_input}:a][{input_count}:a]"
+                    f"amix=inputs=2:duration=first:dropout_transition=2[a{index}]"
+                )
+                audio_map = f"[a{index}]"
+                input_count += 1
+            else:
+                audio_filter = ""
+                audio_map = f"{voice_input}:a:0"
+
+            subtitle_args: List[str] = []
+            if soft_captions:
+                cmd.extend(["-i", str(ass_path)])
+                subtitle_args = ["-map", f"{input_count}:s:0", "-c:s", "mov_text"]
+                input_count += 1
+
+            if is_ready:
+                last_label = f"[{media_input}:v]"
+            else:
+                filter_parts.append(
+                    VIDEO_FILTER_TEMPLATE.format(input=media_input, index=index)
+                )
+                last_label = f"[bg{index}]"
+
+            if burn_captions:
+                filter_parts.append(
+                    SUBTITLE_FILTER_TEMPLATE.format(
+                        source=last_label,
+                        ass=_escape_ffmpeg_filter_path(ass_path),
+                        shaping=shaping,
+                        index=index,
+                    )
+                )
+                last_label = f"[v{index}]"
+
+            if video_codec == "h264_vaapi":
+                filter_parts.append(f"{last_label}format=nv12,hwupload[hw{index}]")
+                last_label = f"[hw{index}]"
+
+            if audio_filter:
+                filter_parts.append(audio_filter)
+
+            if video_codec == "copy":
+                video_args = ["-map", f"{media_input}:v:0", "-c:v", "copy"]
+            else:
+                video_args = [
+                    "-map",
+                    last_label,
+                    "-c:v",
+                    encoder,
+                    *ENCODER_ARGS.get(encoder, []),
+                    *self._x264_args(encoder),
+                ]
+                if is_image and encoder == "libx264":
+                    video_args.extend(["-tune", "stillimage"])
+
+            stream_args = [
+                *video_args,
                 "-map",
                 audio_map,
-                "-c:v",
-                "libx264",
-                "-preset",
-                "medium",
-                "-crf",
-                "23",
-                "-c:a",
-                "aac",
-                "-b:a",
-                "128k",
-                "-pix_fmt",
-                "yuv420p",
-                "-movflags",
-                "+faststart",
-                "-t",
-                str(final_duration),
-                str(output_path),
+                *AUDIO_OUTPUT_ARGS,
+                *subtitle_args,
             ]
-        )
+            output_args.extend(
+                [
+                    *stream_args,
+                    "-movflags",
+                    movflags,
+                    "-t",
+                    str(final_duration),
+                    str(output_path),
+                ]
+            )
+            preflight_args.extend([*stream_args, "-t", "0", "-f", "null", "-"])
+            output_paths.append(output_path)
 
-        try:
-            subprocess.run(cmd, check=True, capture_output=True, text=True)
-            if not output_path.exists() or output_path.stat().st_size == 0:
-                raise RuntimeError(
-                    f"[{self.__class__.__name__}] Output video is empty or missing"
-                )
+        if filter_parts:
+            filter_threads = self.cpu_threads or os.cpu_count() or 1
+            cmd.extend(
+                [
+                    "-filter_complex_threads",
+                    str(filter_threads),
+                    "-filter_complex",
+                    ";".join(filter_parts),
+                ]
+            )
+        preflight_cmd = [*cmd, *preflight_args]
+        cmd.extend(output_args)
 
-            self.logger.info(f"Successfully generated output video: {output_path}")
-            return output_path
+        try:
+            for path, data in subtitle_files:
+                path.write_bytes(data)
+                feeders.append((path, None))
+            # In-memory inputs are pipes that can only be read once.
+            if self.preflight and not streams:
+                self._run_ffmpeg(preflight_cmd)
+            for path, data in streams:
+                feeders.append((path, self._stream_input(path, data)))
+            self._run_ffmpeg(cmd)
+            for output_path in output_paths:
+                if not output_path.exists() or output_path.stat().st_size == 0:
+                    raise RuntimeError(
+                        f"[{self.__class__.__name__}] Output video is empty or missing"
+                    )
+                self.logger.info(f"Successfully generated output video: {output_path}")
+            return output_paths
 
         except subprocess.CalledProcessError as e:
             error_msg = e.stderr or str(e)
@@ -196,3 +921,71 @@ class Editor:
             raise RuntimeError(
                 f"[{self.__class__.__name__}] Error while processing video: {e}"
             ) from e
+        finally:
+            self._close_streams(feeders)
+
+    def assemble_batch(
+        self,
+        jobs: List[Dict[str, Any]],
+        concurrency: Optional[int] = None,
+        threads_per_job: int = 4,
+        jobs_per_process: int = 1,
+    ) -> List[Path]:
+        """
+        Assemble videos in concurrent FFmpeg processes.
+
+        Jobs are split into groups of `jobs_per_process`, and each group runs
+        through `assemble_many` in its own FFmpeg process. Several processes
+        fill cores a single encode leaves idle, while larger groups pay FFmpeg
+        startup and codec initialization once for many short clips.
+
+        Args:
+            jobs: Job dicts, as accepted by `assemble_many`.
+            concurrency: Maximum FFmpeg processes running at once. Defaults
+                         to the core count divided by threads_per_job.
+            threads_per_job: Encoder thread cap for each process.
+            jobs_per_process: Number of jobs sharing one FFmpeg process.
+
+        Returns:
+            List[Path]: Paths to generated output videos, in job order.
+        """
+        if not jobs:
+            return []
+
+        encoder = self.encoder or self._detect_encoder()
+        workers = concurrency or max(1, (os.cpu_count() or 1) // threads_per_job)
+        jobs = [
+            (
+                job
+                if job.get("output_path")
+                else dict(job, output_path=self.workspace / f"output_{index}.mp4")
+            )
+            for index, job in enumerate(jobs)
+        ]
+        size = max(1, jobs_per_process)
+        groups = [jobs[start : start + size] for start in range(0, len(jobs), size)]
+
+        def run(index: int, group: List[Dict[str, Any]]) -> List[Path]:
+            # A private workspace keeps each group's in-memory input pipes apart.
+            workspace = self.workspace / f"batch_{index}"
+            workspace.mkdir(parents=True, exist_ok=True)
+            editor = Editor(
+                workspace,
+                encoder=encoder,
+                cpu_threads=threads_per_job,
+                faststart=self.faststart,
+                preset=self.preset,
+                preflight=self.preflight,
+            )
+            editor._probes = self._probes
+            try:
+                return editor.assemble_many(group)
+            finally:
+                shutil.rmtree(workspace, ignore_errors=True)
+
+        with ThreadPoolExecutor(max_workers=min(workers, len(groups))) as executor:
+            return [
+                path
+                for paths in executor.map(run, range(len(groups)), groups)
+                for path in paths
+            ]
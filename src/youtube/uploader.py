@@ -3,21 +3,30 @@ from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload, ResumableUploadError
+from googleapiclient.http import MediaIoBaseUpload, ResumableUploadError
 from pathlib import Path
 import datetime
 import logging
-from typing import Optional, Union, Dict, Any
-from src.utils.constants import DEFAULT_CHANNEL_NAME, DEFAULT_SECRETS_FILE
+import mmap
+from typing import Optional, Union, Dict, Any, List
+from src.utils.constants import (
+    DEFAULT_CHANNEL_NAME,
+    DEFAULT_SECRETS_FILE,
+    UPLOAD_CHUNK_SIZE,
+)
 
 
 class Uploader:
     """Handles uploading videos to YouTube using OAuth2 authentication."""
 
+    # Authenticated API clients by channel name, shared by every instance.
+    _service_cache: Dict[str, Any] = {}
+
     def __init__(
         self,
         name: str = DEFAULT_CHANNEL_NAME,
         auth_token: Union[str, Path] = DEFAULT_SECRETS_FILE,
+        service: Optional[Any] = None,
     ) -> None:
         """
         Initialize uploader and authenticate with YouTube API.
@@ -25,6 +34,9 @@ class Uploader:
         Args:
             name: Name of channel/app used for token file naming.
             auth_token: Path to OAuth2 client secrets JSON.
+            service: Already authenticated YouTube API client to reuse. By
+                     default the client built for this channel earlier in
+                     the process is reused, if any.
         """
         self.logger: logging.Logger = logging.getLogger(self.__class__.__name__)
         self.name: str = name.replace(" ", "").lower()
@@ -43,9 +55,11 @@ class Uploader:
         self.token_file: Path = self.token_folder / f"{self.name}_token.json"
 
         self.credentials: Optional[Credentials] = None
-        self.service: Optional[Any] = None
+        self.service: Optional[Any] = service or self._service_cache.get(self.name)
 
-        self._authenticate()
+        if self.service is None:
+            self._authenticate()
+            self._service_cache[self.name] = self.service
 
     def _authenticate(self) -> None:
         """Authenticate with stored token or via OAuth flow."""
@@ -84,7 +98,13 @@ class Uploader:
 
             self.token_file.write_text(self.credentials.to_json(), encoding="utf-8")
 
-        self.service = build("youtube", "v3", credentials=self.credentials)
+        self.service = build(
+            "youtube",
+            "v3",
+            credentials=self.credentials,
+            cache_discovery=False,
+            static_discovery=True,
+        )
 
     def upload(
         self, video_data: Dict[str, Any]
@@ -133,12 +153,27 @@ class Uploader:
                 body["status"]["privacyStatus"] = "private"
 
             media_path: Union[str, Path] = video_data.get("video_path")
-            media = MediaFileUpload(str(media_path), mimetype="video/*", resumable=True)
+            with (
+                open(media_path, "rb") as f,
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+            ):
+                # Chunks are sliced straight out of the page cache. Every upload
+                # stays resumable so quota errors surface as ResumableUploadError.
+                media = MediaIoBaseUpload(
+                    mapped,
+                    mimetype="video/*",
+                    chunksize=UPLOAD_CHUNK_SIZE,
+                    resumable=True,
+                )
 
-            request = self.service.videos().insert(
-                part="snippet,status", body=body, media_body=media
-            )
-            response = request.execute()
+                request = self.service.videos().insert(
+                    part="snippet,status", body=body, media_body=media
+                )
+                response = None
+                while response is None:
+                    status, response = request.next_chunk()
+                    if status:
+                        self.logger.debug(f"Upload progress: {status.progress():.0%}")
 
             video_url = f"https://www.youtube.com/watch?v={response['id']}"
             self.logger.info(f"Uploaded successfully: {video_url}")
@@ -149,3 +184,31 @@ class Uploader:
         except Exception as e:
             self.logger.error(f"Failed to upload: {e}")
             return None, None
+
+    def upload_many(
+        self, video_datas: List[Dict[str, Any]]
+    ) -> List[tuple[Optional[str], Optional[datetime.datetime]]]:
+        """
+        Upload several videos through this uploader's API client.
+
+        Uploads run one after another so the client's keep-alive connection,
+        which is not thread-safe, is reused for every video. Each scheduled
+        time becomes the next video's last_upload unless it sets its own.
+
+        Args:
+            video_datas: Dictionaries as accepted by `upload`.
+
+        Returns:
+            List[tuple[Optional[str], Optional[datetime.datetime]]]: Video URL
+                and scheduled time for each video, in order.
+        """
+        results: List[tuple[Optional[str], Optional[datetime.datetime]]] = []
+        last_upload: Optional[datetime.datetime] = None
+        for video_data in video_datas:
+            if last_upload and not video_data.get("last_upload"):
+                video_data = {**video_data, "last_upload": last_upload}
+            video_url, scheduled_time = self.upload(video_data)
+            results.append((video_url, scheduled_time))
+            if video_url and scheduled_time:
+                last_upload = scheduled_time
+        return results
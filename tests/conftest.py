@@ -2,48 +2,74 @@
 Pytest configuration and shared fixtures.
 """
 
-import json
+import copy
+import io
 import os
-import tempfile
+import shutil
+from contextlib import ExitStack
 from pathlib import Path
-from unittest.mock import MagicMock, Mock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
+from google.oauth2.credentials import Credentials
 
+import src.video.editor as editor_module
 from src.preset import YmlHandler
+from tests.stubs import Recorder
+
+# Fake payloads built once at import instead of in every fixture call.
+FAKE_AUDIO_DATA = b"fake_audio_data" * 100
+FAKE_WAV_DATA = b"fake_wav_data" * 100
+FAKE_MP4_DATA = b"fake_mp4_data" * 1000
+FAKE_GEMINI_RESPONSE = (
+    "TRANSCRIPT: Say hello.\nTITLE: Test\nDESCRIPTION: Test\nSEARCH_TERM: test"
+)
 
 
 @pytest.fixture
-def temp_dir():
-    """Create a temporary directory for testing."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+def temp_dir(tmp_path):
+    """Create a temporary directory for testing, unique per xdist worker."""
+    return tmp_path
 
 
-@pytest.fixture
-def temp_preset_file(temp_dir):
-    """Create a temporary preset.yml file."""
-    preset_path = temp_dir / "preset.yml"
-    preset_data = {
-        "NAME": "test_channel",
-        "PROMPT": None,
-        "UPLOAD": False,
-        "DELAY": 2.5,
-        "WHISPER_MODEL": "tiny",
-        "FONT": "Arial",
-        "GEMINI_API_KEY": "test_api_key_12345",
-    }
-    with preset_path.open("w", encoding="utf-8") as f:
-        import yaml
+@pytest.fixture(scope="session")
+def shared_temp_dir(tmp_path_factory):
+    """Create one directory for tests that only build paths and never write to them."""
+    return tmp_path_factory.mktemp("shared")
 
-        yaml.safe_dump(preset_data, f)
+
+PRESET_YAML = (
+    "DELAY: 2.5\n"
+    "FONT: Arial\n"
+    "GEMINI_API_KEY: test_api_key_12345\n"
+    "NAME: test_channel\n"
+    "PROMPT: null\n"
+    "UPLOAD: false\n"
+    "WHISPER_MODEL: tiny\n"
+)
+
+
+@pytest.fixture(scope="session")
+def temp_preset_file(tmp_path_factory):
+    """Create a read-only preset.yml shared by the whole session."""
+    preset_path = tmp_path_factory.mktemp("preset") / "preset.yml"
+    preset_path.write_text(PRESET_YAML, encoding="utf-8")
     return preset_path
 
 
 @pytest.fixture
-def temp_prompt_file(temp_dir):
-    """Create a temporary prompt.yml file."""
-    prompt_path = temp_dir / "prompt.yml"
+def writable_preset_file(temp_dir, temp_preset_file):
+    """Copy the shared preset into a per-test file for tests that modify it."""
+    preset_path = temp_dir / "preset.yml"
+    shutil.copyfile(temp_preset_file, preset_path)
+    return preset_path
+
+
+@pytest.fixture(scope="session")
+def temp_prompt_file(tmp_path_factory):
+    """Create a read-only prompt.yml shared by the whole session."""
+    prompt_path = tmp_path_factory.mktemp("prompt") / "prompt.yml"
     prompt_data = {
         "GET_CONTENT": "Generate content about: {topic}",
         "GET_TITLE": "Create a title for: {content}",
@@ -59,9 +85,49 @@ def temp_prompt_file(temp_dir):
 
 
 @pytest.fixture
-def preset_handler(temp_preset_file):
-    """Create a YmlHandler instance with test preset."""
-    return YmlHandler(temp_preset_file)
+def preset_handler(writable_preset_file):
+    """Create a YmlHandler on a per-test copy of the shared preset."""
+    return YmlHandler(writable_preset_file)
+
+
+@pytest.fixture
+def mock_prompt(monkeypatch):
+    """Make Orchestrator build this stub instead of loading config/prompt.yml."""
+    prompt = SimpleNamespace(build=Recorder("prompt"))
+    monkeypatch.setattr("src.core.orchestrator.Prompt", lambda: prompt)
+    return prompt
+
+
+@pytest.fixture
+def orchestrator_env(shared_temp_dir, preset_handler, mock_prompt):
+    """Build an Orchestrator on lightweight stubs; tests override only what they need."""
+    # Imported here so tests that never build one skip its spacy/whisper imports.
+    from src.core.orchestrator import Orchestrator
+
+    env = SimpleNamespace(
+        plugin=SimpleNamespace(
+            get_media=Recorder(shared_temp_dir / "media.mp4"),
+            get_prompt_context=Recorder(""),
+        ),
+        gemini=MagicMock(
+            aget_audio=AsyncMock(return_value=shared_temp_dir / "audio.wav"),
+            aget_response=AsyncMock(return_value=FAKE_GEMINI_RESPONSE),
+        ),
+        editor=SimpleNamespace(assemble=Recorder(shared_temp_dir / "output.mp4")),
+        handler=SimpleNamespace(
+            get_captions=Recorder((shared_temp_dir / "captions.ass", {}))
+        ),
+        prompt=mock_prompt,
+    )
+    env.orchestrator = Orchestrator(
+        preset=preset_handler,
+        plugin=env.plugin,
+        gemini=env.gemini,
+        editor=env.editor,
+        caption=env.handler,
+        uploader=None,
+    )
+    return env
 
 
 @pytest.fixture
@@ -79,7 +145,7 @@ def mock_gemini_client():
 
     mock_audio_response = MagicMock()
     mock_audio_part = MagicMock()
-    mock_audio_part.inline_data.data = b"fake_audio_data" * 100
+    mock_audio_part.inline_data.data = FAKE_AUDIO_DATA
     mock_audio_candidate = MagicMock()
     mock_audio_candidate.content.parts = [mock_audio_part]
     mock_audio_response.candidates = [mock_audio_candidate]
@@ -94,13 +160,56 @@ def mock_gemini_client():
     return client
 
 
+@pytest.fixture(scope="class")
+def _shared_gemini(tmp_path_factory):
+    """Build one Gemini instance per test class."""
+    from src.response import Gemini
+
+    return Gemini(client=MagicMock(), workspace=tmp_path_factory.mktemp("gemini"))
+
+
+@pytest.fixture
+def gemini(_shared_gemini, mock_gemini_client):
+    """Class-wide Gemini instance wired to this test's mock client."""
+    _shared_gemini.client = mock_gemini_client
+    return _shared_gemini
+
+
+def _fake_process(stdout=b"", stderr=b"", returncode=0):
+    """Build a finished Popen stand-in with the given output and exit code."""
+    process = Mock(stdout=io.BytesIO(stdout), stderr=io.BytesIO(stderr))
+    process.wait.return_value = returncode
+    return process
+
+
 @pytest.fixture
-def mock_ffmpeg_probe(monkeypatch):
+def mock_ffmpeg_popen(monkeypatch, _no_real_subprocess):
+    """Mock FFmpeg runs started through subprocess.Popen.
+
+    Set `returncode` and `stderr` (bytes) on the returned mock to simulate a
+    failing run, or `stdout` (bytes) to feed a progress report; `call_args`
+    holds the last command.
+    """
+
+    def popen(cmd, **kwargs):
+        return _fake_process(
+            mock_popen.stdout, mock_popen.stderr, mock_popen.returncode
+        )
+
+    import subprocess
+
+    mock_popen = Mock(side_effect=popen, returncode=0, stdout=b"", stderr=b"")
+    monkeypatch.setattr(subprocess, "Popen", mock_popen)
+    return mock_popen
+
+
+@pytest.fixture
+def mock_ffmpeg_probe(monkeypatch, mock_ffmpeg_popen):
     """Mock ffprobe subprocess calls."""
 
     def mock_check_output(cmd, **kwargs):
-        if "ffprobe" in cmd:
-            return json.dumps({"format": {"duration": "30.5"}}).encode()
+        if cmd[0].endswith("ffprobe"):
+            return b"duration=30.5\n"
         return b""
 
     import subprocess
@@ -110,7 +219,7 @@ def mock_ffmpeg_probe(monkeypatch):
 
 
 @pytest.fixture
-def mock_ffmpeg_success(monkeypatch):
+def mock_ffmpeg_success(monkeypatch, mock_ffmpeg_popen):
     """Mock successful FFmpeg subprocess calls."""
 
     def mock_run(cmd, **kwargs):
@@ -142,16 +251,78 @@ def mock_file_exists(monkeypatch):
     monkeypatch.setattr(Path, "exists", exists)
 
 
+@pytest.fixture(scope="module")
+def _core_patch_stack():
+    """Patch the collaborators `Core` builds, once per test module."""
+    targets = {
+        "client_class": "src.core.app.genai.Client",
+        "orchestrator_class": "src.core.app.Orchestrator",
+        "plugin_registry_class": "src.core.app.PluginRegistry",
+        "gemini_class": "src.core.app.Gemini",
+        "handler_class": "src.core.app.Handler",
+        "editor_class": "src.core.app.Editor",
+        "uploader_class": "src.core.app.Uploader",
+    }
+    with ExitStack() as stack:
+        yield SimpleNamespace(
+            **{
+                name: stack.enter_context(patch(target))
+                for name, target in targets.items()
+            }
+        )
+
+
+@pytest.fixture
+def core_patches(_core_patch_stack):
+    """Module-wide `Core` patches, reset for each test.
+
+    The plugin registry reports every plugin as available.
+    """
+    for mock in vars(_core_patch_stack).values():
+        mock.reset_mock(return_value=True, side_effect=True)
+
+    plugin_registry = _core_patch_stack.plugin_registry_class.return_value
+    plugin_registry.has_plugin.return_value = True
+    plugin_registry.get_plugin.return_value = MagicMock()
+    return _core_patch_stack
+
+
 @pytest.fixture
 def mock_youtube_service():
-    """Create a mock YouTube API service."""
-    service = MagicMock()
-    mock_insert = MagicMock()
-    mock_request = MagicMock()
-    mock_request.execute.return_value = {"id": "test_video_id_123"}
-    mock_insert.return_value = mock_request
-    service.videos.return_value = MagicMock(insert=mock_insert)
-    return service
+    """Create a mock YouTube API service whose videos().insert() upload finishes in one chunk."""
+    next_chunk = Mock(return_value=(None, {"id": "test_video_id_123"}))
+    insert = Mock(return_value=Mock(next_chunk=next_chunk))
+    return Mock(videos=Mock(return_value=Mock(insert=insert)))
+
+
+@pytest.fixture(scope="session")
+def _credentials_proto():
+    """Build valid OAuth credentials once for the whole session."""
+    credentials = MagicMock(spec=Credentials)
+    credentials.valid = True
+    credentials.refresh_token = "fake_refresh"
+    credentials.to_json.return_value = '{"token": "fake_token"}'
+    return credentials
+
+
+@pytest.fixture
+def mock_credentials(_credentials_proto):
+    """Shallow copy of the valid OAuth credentials prototype."""
+    return copy.copy(_credentials_proto)
+
+
+@pytest.fixture(scope="session")
+def _flow_proto(_credentials_proto):
+    """Build an OAuth flow whose local server returns valid credentials once."""
+    flow = MagicMock()
+    flow.run_local_server.return_value = _credentials_proto
+    return flow
+
+
+@pytest.fixture
+def mock_flow(_flow_proto):
+    """Shallow copy of the OAuth flow prototype."""
+    return copy.copy(_flow_proto)
 
 
 @pytest.fixture
@@ -174,7 +345,7 @@ CATEGORY_ID: 24"""
 def sample_audio_file(temp_dir):
     """Create a sample audio file."""
     audio_path = temp_dir / "test_audio.wav"
-    audio_path.write_bytes(b"fake_wav_data" * 100)
+    audio_path.write_bytes(FAKE_WAV_DATA)
     return audio_path
 
 
@@ -182,7 +353,7 @@ def sample_audio_file(temp_dir):
 def sample_video_file(temp_dir):
     """Create a sample video file."""
     video_path = temp_dir / "test_video.mp4"
-    video_path.write_bytes(b"fake_mp4_data" * 1000)
+    video_path.write_bytes(FAKE_MP4_DATA)
     return video_path
 
 
@@ -199,6 +370,27 @@ Dialogue: 0,0:00:00.00,0:00:05.00,Dynamic,,0,0,0,,Test subtitle
     return ass_path
 
 
+@pytest.fixture(autouse=True)
+def _no_real_subprocess(monkeypatch, request):
+    """Stub subprocess calls so tests never spawn a real ffmpeg/ffprobe.
+
+    In-process PyAV probing is disabled too, so probes go through the stubs.
+    Tests that need the real binaries opt out with `@pytest.mark.real_subprocess`.
+    """
+    if "real_subprocess" in request.keywords:
+        return
+
+    monkeypatch.setattr(editor_module, "PYAV_AVAILABLE", False)
+
+    import subprocess
+
+    monkeypatch.setattr(subprocess, "check_output", Mock(return_value=b""))
+    monkeypatch.setattr(subprocess, "run", Mock(return_value=Mock(returncode=0)))
+    monkeypatch.setattr(
+        subprocess, "Popen", Mock(side_effect=lambda cmd, **kwargs: _fake_process())
+    )
+
+
 @pytest.fixture(autouse=True)
 def reset_environment(monkeypatch):
     """Reset environment variables before each test."""
@@ -258,3 +450,18 @@ def mock_spacy_model():
 
     with patch("spacy.load", side_effect=load_side_effect):
         yield mock_model
+
+
+def pytest_collection_modifyitems(config, items):
+    """Leave benchmarks out of the default run; `--benchmark-only` runs them.
+
+    Kept here rather than as `--benchmark-skip` in pytest.ini, which would
+    break every run in an environment without pytest-benchmark.
+    """
+    if getattr(config.option, "benchmark_only", False):
+        return
+
+    skip = pytest.mark.skip(reason="benchmark (run with --benchmark-only)")
+    for item in items:
+        if "benchmark" in getattr(item, "fixturenames", ()):
+            item.add_marker(skip)
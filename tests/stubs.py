@@ -0,0 +1,58 @@
+"""
+Lightweight stubs and helpers for tests that only need return values and call args.
+"""
+
+from types import SimpleNamespace
+from typing import Any, List, Tuple
+
+from google.genai.errors import ClientError
+from googleapiclient.http import ResumableUploadError
+
+
+def forbidden_upload_error() -> ResumableUploadError:
+    """
+    Build a fresh 403 upload error, so no traceback carries over between tests.
+
+    Returns:
+        ResumableUploadError: Error raised by a quota-limited upload.
+    """
+    return ResumableUploadError(
+        SimpleNamespace(status=403, reason="Forbidden"), b"Forbidden"
+    )
+
+
+class MockQuotaError(ClientError):
+    """ClientError stand-in whose message is the only thing the tests read."""
+
+    def __init__(self, msg="429 RESOURCE_EXHAUSTED: Quota exceeded"):
+        self._msg = msg
+
+    def __str__(self):
+        return self._msg
+
+
+class Recorder:
+    """Callable that returns a fixed value and records every call."""
+
+    def __init__(self, return_value: Any = None) -> None:
+        self.return_value = return_value
+        self.calls: List[Tuple[tuple, dict]] = []
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        self.calls.append((args, kwargs))
+        return self.return_value
+
+
+def set_upload_result(service: Any, result: Any) -> None:
+    """
+    Set what the mocked YouTube service's upload request produces.
+
+    Args:
+        service: Mock YouTube service from the mock_youtube_service fixture.
+        result: Final response to return, or an exception instance to raise.
+    """
+    next_chunk = service.videos.return_value.insert.return_value.next_chunk
+    if isinstance(result, BaseException):
+        next_chunk.side_effect = result
+    else:
+        next_chunk.return_value = (None, result)
@@ -3,7 +3,8 @@ Tests for video.Editor class.
 """
 
 from pathlib import Path
-from unittest.mock import Mock
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock
 
 import pytest
 
@@ -29,6 +30,80 @@ class TestEditor:
         duration = editor._get_duration(test_file)
         assert duration == 30.5
 
+    def test_get_duration_cached(self, temp_dir, monkeypatch):
+        """Test repeated probes of an unchanged file reuse the cached duration."""
+        import subprocess
+
+        editor = Editor(workspace=temp_dir)
+        test_file = temp_dir / "test.mp4"
+        test_file.write_bytes(b"fake_video_data")
+
+        mock_check_output = Mock(return_value=b"duration=12.0\n")
+        monkeypatch.setattr(subprocess, "check_output", mock_check_output)
+
+        assert editor._get_duration(test_file) == 12.0
+        assert editor._get_duration(test_file) == 12.0
+        assert mock_check_output.call_count == 1
+
+        test_file.write_bytes(b"changed_video_data")
+        editor._get_duration(test_file)
+        assert mock_check_output.call_count == 2
+
+    def test_get_duration_reads_wav_header(self, temp_dir, monkeypatch):
+        """Test WAV durations come from the header without probing."""
+        import subprocess
+        import wave
+
+        wav_path = temp_dir / "voice.wav"
+        with wave.open(str(wav_path), "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(24000)
+            wav.writeframes(b"\x00\x00" * 36000)
+
+        mock_check_output = Mock()
+        monkeypatch.setattr(subprocess, "check_output", mock_check_output)
+
+        editor = Editor(workspace=temp_dir)
+        assert editor._get_duration(wav_path) == 1.5
+        assert editor._get_duration(wav_path.read_bytes()) == 1.5
+        mock_check_output.assert_not_called()
+
+    def test_probe_in_process_with_pyav(self, temp_dir, monkeypatch):
+        """Test PyAV probing reads the container without spawning FFprobe."""
+        import subprocess
+        import src.video.editor as editor_module
+
+        codec = SimpleNamespace(
+            name="h264", width=1080, height=1920, pix_fmt="yuv420p"
+        )
+        container = MagicMock(duration=12_500_000)
+        container.__enter__.return_value = container
+        container.streams.video = (SimpleNamespace(codec_context=codec),)
+        fake_av = SimpleNamespace(
+            open=Mock(return_value=container),
+            time_base=1_000_000,
+            error=SimpleNamespace(FFmpegError=OSError),
+        )
+        monkeypatch.setattr(editor_module, "PYAV_AVAILABLE", True)
+        monkeypatch.setattr(editor_module, "av", fake_av, raising=False)
+        mock_check_output = Mock()
+        monkeypatch.setattr(subprocess, "check_output", mock_check_output)
+
+        editor = Editor(workspace=temp_dir)
+        test_file = temp_dir / "test.mp4"
+        test_file.write_bytes(b"fake_video_data")
+
+        assert editor._probe(test_file) == {
+            "duration": 12.5,
+            "codec_name": "h264",
+            "width": 1080,
+            "height": 1920,
+            "pix_fmt": "yuv420p",
+        }
+        fake_av.open.assert_called_once_with(str(test_file))
+        mock_check_output.assert_not_called()
+
     def test_get_duration_file_not_found(self, temp_dir):
         """Test duration retrieval with non-existent file."""
         editor = Editor(workspace=temp_dir)
@@ -69,10 +144,9 @@ class TestEditor:
         sample_video_file,
         sample_ass_file,
         mock_ffmpeg_probe,
-        monkeypatch,
+        mock_ffmpeg_popen,
     ):
         """Test assembly with background audio and suppressed captions."""
-        import subprocess
         editor = Editor(workspace=temp_dir)
         
         output_path = temp_dir / "output.mp4"
@@ -80,15 +154,6 @@ class TestEditor:
         
         bg_audio = temp_dir / "bg.mp3"
         bg_audio.write_bytes(b"fake")
-        
-        # Capture the command passed to subprocess.run
-        captured_cmd = []
-        def mock_run(cmd, **kwargs):
-            captured_cmd.extend(cmd)
-            result = Mock()
-            result.returncode = 0
-            return result
-        monkeypatch.setattr(subprocess, "run", mock_run)
 
         editor.assemble(
             ass_path=sample_ass_file,
@@ -97,7 +162,8 @@ class TestEditor:
             background_audio_path=bg_audio,
             suppress_captions=True
         )
-        
+
+        captured_cmd = mock_ffmpeg_popen.call_args[0][0]
         cmd_str = " ".join(captured_cmd)
         
         # Verify background audio input
@@ -164,7 +230,7 @@ class TestEditor:
         editor = Editor(workspace=temp_dir)
 
         # Mock duration to return 0
-        def mock_get_duration(file_path):
+        def mock_get_duration(file_path, stat=None):
             return 0.0
 
         monkeypatch.setattr(editor, "_get_duration", mock_get_duration)
@@ -183,26 +249,606 @@ class TestEditor:
         sample_audio_file,
         sample_video_file,
         mock_ffmpeg_probe,
-        monkeypatch,
+        mock_ffmpeg_popen,
     ):
         """Test assembly when FFmpeg fails."""
-        import subprocess
-
         editor = Editor(workspace=temp_dir)
 
-        def mock_run_fail(cmd, **kwargs):
-            result = Mock()
-            result.returncode = 1
-            result.stderr = "FFmpeg error: invalid codec"
-            error = subprocess.CalledProcessError(1, cmd, stderr=result.stderr)
-            result.check_returncode = Mock(side_effect=error)
-            return result
+        mock_ffmpeg_popen.returncode = 1
+        mock_ffmpeg_popen.stderr = b"FFmpeg error: invalid codec\n"
 
-        monkeypatch.setattr(subprocess, "run", mock_run_fail)
-
-        with pytest.raises(RuntimeError, match="Error while processing video"):
+        with pytest.raises(RuntimeError, match="invalid codec"):
             editor.assemble(
                 ass_path=sample_ass_file,
                 audio_path=sample_audio_file,
                 media_path=sample_video_file,
             )
+
+    def test_assemble_many_single_invocation(
+        self,
+        temp_dir,
+        sample_audio_file,
+        sample_video_file,
+        sample_ass_file,
+        mock_ffmpeg_probe,
+        mock_ffmpeg_popen,
+    ):
+        """Test batch assembly runs one FFmpeg process with one output per job."""
+        editor = Editor(workspace=temp_dir)
+        for index in range(2):
+            (temp_dir / f"output_{index}.mp4").write_bytes(b"fake")
+
+        job = {
+            "ass_path": sample_ass_file,
+            "audio_path": sample_audio_file,
+            "media_path": sample_video_file,
+        }
+        results = editor.assemble_many([job, dict(job, suppress_captions=True)])
+
+        assert results == [temp_dir / "output_0.mp4", temp_dir / "output_1.mp4"]
+        assert mock_ffmpeg_popen.call_count == 1
+
+        cmd = mock_ffmpeg_popen.call_args[0][0]
+        assert cmd.count("-i") == 4
+        assert str(temp_dir / "output_0.mp4") in cmd
+        assert str(temp_dir / "output_1.mp4") in cmd
+        assert cmd[cmd.index("-filter_complex") + 1].count("ass=") == 1
+
+    def test_assemble_batch_runs_one_process_per_job(
+        self,
+        temp_dir,
+        sample_audio_file,
+        sample_video_file,
+        sample_ass_file,
+        mock_ffmpeg_probe,
+        mock_ffmpeg_popen,
+    ):
+        """Test concurrent batch assembly gives each job its own capped FFmpeg."""
+        editor = Editor(workspace=temp_dir, encoder="libx264")
+        for index in range(3):
+            (temp_dir / f"output_{index}.mp4").write_bytes(b"fake")
+
+        job = {
+            "ass_path": sample_ass_file,
+            "audio_path": sample_audio_file,
+            "media_path": sample_video_file,
+        }
+        results = editor.assemble_batch([job] * 3, concurrency=2, threads_per_job=2)
+
+        assert results == [temp_dir / f"output_{index}.mp4" for index in range(3)]
+        assert mock_ffmpeg_popen.call_count == 3
+        for call in mock_ffmpeg_popen.call_args_list:
+            cmd = call[0][0]
+            assert cmd.count("-i") == 2
+            assert cmd[cmd.index("-threads") + 1] == "2"
+        assert not list(temp_dir.glob("batch_*"))
+
+    def test_assemble_batch_groups_jobs_per_process(
+        self,
+        temp_dir,
+        sample_audio_file,
+        sample_video_file,
+        sample_ass_file,
+        mock_ffmpeg_probe,
+        mock_ffmpeg_popen,
+    ):
+        """Test grouped batch jobs share FFmpeg processes and keep job order."""
+        editor = Editor(workspace=temp_dir, encoder="libx264")
+        for index in range(3):
+            (temp_dir / f"output_{index}.mp4").write_bytes(b"fake")
+
+        job = {
+            "ass_path": sample_ass_file,
+            "audio_path": sample_audio_file,
+            "media_path": sample_video_file,
+        }
+        results = editor.assemble_batch([job] * 3, concurrency=1, jobs_per_process=2)
+
+        assert results == [temp_dir / f"output_{index}.mp4" for index in range(3)]
+        cmds = [call[0][0] for call in mock_ffmpeg_popen.call_args_list]
+        assert [cmd.count("-i") for cmd in cmds] == [4, 2]
+
+    def test_prefetch_probes(self, temp_dir, monkeypatch):
+        """Test prefetching probes only the inputs that need FFprobe, once each."""
+        import subprocess
+
+        mock_check_output = Mock(return_value=b"duration=30.5\n")
+        monkeypatch.setattr(subprocess, "check_output", mock_check_output)
+        editor = Editor(workspace=temp_dir)
+        clips = []
+        for name in ("a.mp4", "b.mp4", "voice.wav", "still.png"):
+            clips.append(temp_dir / name)
+            clips[-1].write_bytes(b"fake_media_data")
+
+        stats = editor._prefetch_probes([*clips, clips[0], b"raw_bytes"])
+
+        assert sorted(stats) == sorted(str(clip) for clip in clips)
+        probed = sorted(call[0][0][-1] for call in mock_check_output.call_args_list)
+        assert probed == [str(clips[0]), str(clips[1])]
+        assert editor._get_duration(clips[0], stats[str(clips[0])]) == 30.5
+        assert mock_check_output.call_count == 2
+
+        # Cached probes are skipped; a lone new clip is left for assembly to probe.
+        import src.video.editor as editor_module
+
+        clips.append(temp_dir / "c.mp4")
+        clips[-1].write_bytes(b"fake_media_data")
+        monkeypatch.setattr(editor_module, "ThreadPoolExecutor", Mock())
+        editor._prefetch_probes(clips)
+        assert not editor_module.ThreadPoolExecutor.called
+        assert mock_check_output.call_count == 2
+
+    def test_assemble_filtergraph_converts_pixel_format(
+        self,
+        temp_dir,
+        sample_audio_file,
+        sample_video_file,
+        sample_ass_file,
+        mock_ffmpeg_probe,
+        mock_ffmpeg_popen,
+    ):
+        """Test the pixel format conversion happens inside the filtergraph."""
+        editor = Editor(workspace=temp_dir, encoder="libx264")
+        (temp_dir / "output.mp4").write_bytes(b"fake")
+
+        editor.assemble(
+            ass_path=sample_ass_file,
+            audio_path=sample_audio_file,
+            media_path=sample_video_file,
+        )
+
+        cmd = mock_ffmpeg_popen.call_args[0][0]
+        filter_complex = cmd[cmd.index("-filter_complex") + 1]
+        assert "flags=fast_bilinear" in filter_complex
+        assert filter_complex.index("format=yuv420p") < filter_complex.index("ass=")
+        assert "-pix_fmt" not in cmd
+
+    def test_detect_encoder_prefers_working_hardware(self, monkeypatch):
+        """Test encoder detection picks a listed hardware encoder that passes a trial."""
+        import subprocess
+
+        monkeypatch.setattr(Editor, "_detected_encoder", None)
+        monkeypatch.setattr(
+            subprocess,
+            "check_output",
+            Mock(return_value=b" V....D h264_nvenc  NVIDIA NVENC H.264 encoder\n"),
+        )
+        mock_run = Mock(return_value=Mock(returncode=0))
+        monkeypatch.setattr(subprocess, "run", mock_run)
+
+        assert Editor._detect_encoder() == "h264_nvenc"
+        assert Editor._detect_encoder() == "h264_nvenc"
+        assert mock_run.call_count == 1
+
+    def test_detect_encoder_falls_back_to_libx264(self, monkeypatch):
+        """Test encoder detection falls back to libx264 when the trial encode fails."""
+        import subprocess
+
+        monkeypatch.setattr(Editor, "_detected_encoder", None)
+        monkeypatch.setattr(
+            subprocess,
+            "check_output",
+            Mock(return_value=b" V....D h264_nvenc  NVIDIA NVENC H.264 encoder\n"),
+        )
+        monkeypatch.setattr(subprocess, "run", Mock(return_value=Mock(returncode=1)))
+
+        assert Editor._detect_encoder() == "libx264"
+
+    def test_assemble_encoder_override(
+        self,
+        temp_dir,
+        sample_audio_file,
+        sample_video_file,
+        sample_ass_file,
+        mock_ffmpeg_probe,
+        mock_ffmpeg_popen,
+    ):
+        """Test an explicit encoder is used with its own arguments."""
+        editor = Editor(workspace=temp_dir, encoder="h264_nvenc")
+        (temp_dir / "output.mp4").write_bytes(b"fake")
+
+        editor.assemble(
+            ass_path=sample_ass_file,
+            audio_path=sample_audio_file,
+            media_path=sample_video_file,
+        )
+
+        cmd = mock_ffmpeg_popen.call_args[0][0]
+        assert cmd[cmd.index("-c:v") + 1] == "h264_nvenc"
+        assert "-cq" in cmd
+        assert "-crf" not in cmd
+        assert cmd[cmd.index("-hwaccel") + 1] == "cuda"
+        assert cmd.index("-hwaccel") < cmd.index(str(sample_video_file))
+
+    def test_assemble_streams_in_memory_inputs(
+        self,
+        temp_dir,
+        sample_video_file,
+        mock_ffmpeg_probe,
+        mock_ffmpeg_popen,
+    ):
+        """Test bytes inputs are streamed through workspace pipes and cleaned up."""
+        editor = Editor(workspace=temp_dir, encoder="libx264")
+        (temp_dir / "output.mp4").write_bytes(b"fake")
+
+        editor.assemble(
+            ass_path=b"[Script Info]\n",
+            audio_path=b"fake_wav_data",
+            media_path=sample_video_file,
+        )
+
+        cmd = mock_ffmpeg_popen.call_args[0][0]
+        assert str(temp_dir / "audio_0") in cmd
+        assert "captions_0.ass" in cmd[cmd.index("-filter_complex") + 1]
+        assert not (temp_dir / "audio_0").exists()
+        assert not (temp_dir / "captions_0.ass").exists()
+
+    @pytest.mark.parametrize("hardsub", [True, False])
+    def test_assemble_in_memory_captions_file_type(
+        self,
+        temp_dir,
+        sample_audio_file,
+        sample_video_file,
+        mock_ffmpeg_probe,
+        mock_ffmpeg_popen,
+        hardsub,
+    ):
+        """Test burned-in bytes captions are a seekable file; soft ones may be a pipe."""
+        import os
+        import stat
+
+        editor = Editor(workspace=temp_dir, encoder="libx264")
+        (temp_dir / "output.mp4").write_bytes(b"fake")
+        captions = temp_dir / "captions_0.ass"
+        modes = []
+        run_ffmpeg = mock_ffmpeg_popen.side_effect
+
+        def popen(cmd, **kwargs):
+            modes.append(captions.stat().st_mode)
+            if stat.S_ISREG(modes[-1]):
+                assert captions.read_bytes() == b"[Script Info]\n"
+            return run_ffmpeg(cmd, **kwargs)
+
+        mock_ffmpeg_popen.side_effect = popen
+
+        editor.assemble(
+            ass_path=b"[Script Info]\n",
+            audio_path=sample_audio_file,
+            media_path=sample_video_file,
+            hardsub=hardsub,
+        )
+
+        assert len(modes) == 1
+        if hardsub:
+            assert stat.S_ISREG(modes[0])
+        elif hasattr(os, "mkfifo"):
+            assert stat.S_ISFIFO(modes[0])
+        assert not captions.exists()
+
+    def test_init_use_ramdisk(self, temp_dir):
+        """Test the ramdisk option moves the workspace onto tmpfs."""
+        from src.video.editor import RAMDISK_DIR
+
+        if not RAMDISK_DIR.is_dir():
+            pytest.skip("tmpfs not available")
+
+        with Editor(workspace=temp_dir, use_ramdisk=True) as editor:
+            assert editor.workspace.parent == RAMDISK_DIR
+            assert editor.workspace.name.startswith("crank-")
+            (editor.workspace / "output.mp4").write_bytes(b"fake")
+
+        assert not editor.workspace.exists()
+        Editor(workspace=temp_dir).close()
+
+    def test_run_ffmpeg_keeps_stderr_tail(self, temp_dir, mock_ffmpeg_popen):
+        """Test only the last lines of FFmpeg stderr are kept for the error."""
+        import subprocess
+
+        from src.video.editor import STDERR_TAIL_LINES
+
+        editor = Editor(workspace=temp_dir)
+        mock_ffmpeg_popen.returncode = 1
+        mock_ffmpeg_popen.stderr = b"".join(
+            f"line {i}\n".encode() for i in range(STDERR_TAIL_LINES + 50)
+        )
+
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
+            editor._run_ffmpeg(["ffmpeg", "-i", "input.mp4", "output.mp4"])
+
+        assert "line 0\n" not in exc_info.value.stderr
+        assert exc_info.value.stderr.count("\n") == STDERR_TAIL_LINES
+        assert exc_info.value.stderr.endswith(f"line {STDERR_TAIL_LINES + 49}\n")
+
+    def test_run_ffmpeg_stubbed_by_default(self, temp_dir):
+        """Test FFmpeg runs never reach a real process without an explicit mock."""
+        import subprocess
+
+        Editor(workspace=temp_dir)._run_ffmpeg(["ffmpeg", "-version"])
+        assert subprocess.Popen.call_count == 1
+
+    def test_x264_args(self, temp_dir):
+        """Test libx264 gets its preset, threading and tuning args, honouring the caps."""
+        editor = Editor(workspace=temp_dir)
+        args = editor._x264_args("libx264")
+        assert args[args.index("-threads") + 1] == "0"
+        assert "threads=auto" in args[args.index("-x264-params") + 1]
+
+        capped = Editor(workspace=temp_dir, cpu_threads=4)._x264_args("libx264")
+        assert capped[capped.index("-threads") + 1] == "4"
+        assert "threads=4" in capped[capped.index("-x264-params") + 1]
+
+        fast = Editor(workspace=temp_dir, preset="superfast")._x264_args("libx264")
+        assert fast[fast.index("-preset") + 1] == "superfast"
+        assert "bframes=2" in fast[fast.index("-x264-params") + 1]
+
+        assert editor._x264_args("h264_nvenc") == []
+
+    def test_assemble_filter_threads(
+        self,
+        temp_dir,
+        sample_audio_file,
+        sample_video_file,
+        sample_ass_file,
+        mock_ffmpeg_probe,
+        mock_ffmpeg_popen,
+    ):
+        """Test the filtergraph thread count follows the CPU thread cap."""
+        editor = Editor(workspace=temp_dir, encoder="libx264", cpu_threads=3)
+        (temp_dir / "output.mp4").write_bytes(b"fake")
+
+        editor.assemble(
+            ass_path=sample_ass_file,
+            audio_path=sample_audio_file,
+            media_path=sample_video_file,
+        )
+
+        cmd = mock_ffmpeg_popen.call_args[0][0]
+        assert cmd[cmd.index("-filter_complex_threads") + 1] == "3"
+        assert cmd.index("-filter_complex_threads") < cmd.index("-filter_complex")
+
+    def test_assemble_preflight(
+        self,
+        temp_dir,
+        sample_audio_file,
+        sample_video_file,
+        sample_ass_file,
+        mock_ffmpeg_probe,
+        mock_ffmpeg_popen,
+    ):
+        """Test preflight runs a zero-length null encode first and fails fast."""
+        editor = Editor(workspace=temp_dir, encoder="libx264", preflight=True)
+        (temp_dir / "output.mp4").write_bytes(b"fake")
+        kwargs = {
+            "ass_path": sample_ass_file,
+            "audio_path": sample_audio_file,
+            "media_path": sample_video_file,
+        }
+
+        editor.assemble(**kwargs)
+
+        preflight, encode = (call[0][0] for call in mock_ffmpeg_popen.call_args_list)
+        assert preflight[-5:] == ["-t", "0", "-f", "null", "-"]
+        assert "-movflags" not in preflight
+        assert encode[-1] == str(temp_dir / "output.mp4")
+
+        mock_ffmpeg_popen.reset_mock()
+        mock_ffmpeg_popen.returncode = 1
+        with pytest.raises(RuntimeError, match="Error while processing video"):
+            editor.assemble(**kwargs)
+        assert mock_ffmpeg_popen.call_count == 1
+
+    def test_escape_ffmpeg_filter_path(self):
+        """Test paths are escaped for both the option and filtergraph levels."""
+        from src.video.editor import _escape_ffmpeg_filter_path
+
+        assert _escape_ffmpeg_filter_path("/tmp/subs.ass") == "/tmp/subs.ass"
+        assert (
+            _escape_ffmpeg_filter_path("/tmp/it's a:b,c.ass")
+            == "/tmp/it\\\\\\'s a\\\\:b\\,c.ass"
+        )
+
+    def test_subtitle_shaping(self, temp_dir):
+        """Test ASCII-only subtitles use libass's simple shaper."""
+        from src.video.editor import _subtitle_shaping
+
+        ass_path = temp_dir / "captions.ass"
+        ass_path.write_text("Dialogue: 0,0:00:00.00,0:00:01.00,Default,,0,0,0,,Hello")
+        assert _subtitle_shaping(ass_path) == "simple"
+        assert _subtitle_shaping("Dialogue: مرحبا".encode("utf-8")) == "auto"
+
+    def test_assemble_without_faststart(
+        self,
+        temp_dir,
+        sample_audio_file,
+        sample_video_file,
+        sample_ass_file,
+        mock_ffmpeg_probe,
+        mock_ffmpeg_popen,
+    ):
+        """Test disabling faststart writes a fragmented MP4 in a single pass."""
+        editor = Editor(workspace=temp_dir, encoder="libx264", faststart=False)
+        (temp_dir / "output.mp4").write_bytes(b"fake")
+
+        editor.assemble(
+            ass_path=sample_ass_file,
+            audio_path=sample_audio_file,
+            media_path=sample_video_file,
+        )
+
+        cmd = mock_ffmpeg_popen.call_args[0][0]
+        assert cmd[cmd.index("-movflags") + 1] == "+frag_keyframe+empty_moov"
+
+    @pytest.mark.parametrize("suppress_captions", [True, False])
+    def test_assemble_skips_scaling_for_ready_media(
+        self,
+        temp_dir,
+        sample_audio_file,
+        sample_video_file,
+        sample_ass_file,
+        mock_ffmpeg_popen,
+        monkeypatch,
+        suppress_captions,
+    ):
+        """Test media already in output format is copied or only gets subtitles."""
+        import subprocess
+
+        probe = (
+            b"codec_name=h264\nwidth=1080\nheight=1920\npix_fmt=yuv420p\n"
+            b"duration=30.5\n"
+        )
+        monkeypatch.setattr(subprocess, "check_output", Mock(return_value=probe))
+        editor = Editor(workspace=temp_dir, encoder="libx264")
+        (temp_dir / "output.mp4").write_bytes(b"fake")
+
+        editor.assemble(
+            ass_path=sample_ass_file,
+            audio_path=sample_audio_file,
+            media_path=sample_video_file,
+            suppress_captions=suppress_captions,
+        )
+
+        cmd = mock_ffmpeg_popen.call_args[0][0]
+        if suppress_captions:
+            assert "-filter_complex" not in cmd
+            assert cmd[cmd.index("-c:v") + 1] == "copy"
+        else:
+            filter_complex = cmd[cmd.index("-filter_complex") + 1]
+            assert filter_complex.startswith("[0:v]ass=")
+            assert "scale=" not in filter_complex
+            assert cmd[cmd.index("-c:v") + 1] == "libx264"
+
+    @pytest.mark.parametrize("encoder", ["libx264", "h264_vaapi"])
+    def test_assemble_soft_subtitles_copy_ready_media(
+        self,
+        temp_dir,
+        sample_audio_file,
+        sample_video_file,
+        sample_ass_file,
+        mock_ffmpeg_popen,
+        monkeypatch,
+        encoder,
+    ):
+        """Test hardsub=False muxes a mov_text track and stream-copies the video."""
+        import subprocess
+
+        probe = (
+            b"codec_name=h264\nwidth=1080\nheight=1920\npix_fmt=yuv420p\n"
+            b"duration=30.5\n"
+        )
+        monkeypatch.setattr(subprocess, "check_output", Mock(return_value=probe))
+        editor = Editor(workspace=temp_dir, encoder=encoder)
+        (temp_dir / "output.mp4").write_bytes(b"fake")
+
+        editor.assemble(
+            ass_path=sample_ass_file,
+            audio_path=sample_audio_file,
+            media_path=sample_video_file,
+            hardsub=False,
+        )
+
+        cmd = mock_ffmpeg_popen.call_args[0][0]
+        assert "-filter_complex" not in cmd
+        assert cmd[cmd.index("-c:v") + 1] == "copy"
+        assert encoder not in cmd
+        assert cmd[cmd.index(str(sample_ass_file)) - 1] == "-i"
+        assert cmd[cmd.index("-c:s") + 1] == "mov_text"
+        assert "2:s:0" in cmd
+
+    def test_assemble_stats_each_input_once(
+        self,
+        temp_dir,
+        sample_audio_file,
+        sample_video_file,
+        sample_ass_file,
+        mock_ffmpeg_probe,
+        mock_ffmpeg_popen,
+        monkeypatch,
+    ):
+        """Test input files are stat'ed once and reused for the probe cache key."""
+        import os
+
+        editor = Editor(workspace=temp_dir, encoder="libx264")
+        (temp_dir / "output.mp4").write_bytes(b"fake")
+        inputs = {str(sample_ass_file), str(sample_audio_file), str(sample_video_file)}
+        calls = []
+        real_stat = os.stat
+
+        def counting_stat(path, *args, **kwargs):
+            if str(path) in inputs:
+                calls.append(str(path))
+            return real_stat(path, *args, **kwargs)
+
+        monkeypatch.setattr(os, "stat", counting_stat)
+
+        editor.assemble(
+            ass_path=sample_ass_file,
+            audio_path=sample_audio_file,
+            media_path=sample_video_file,
+        )
+
+        assert sorted(calls) == sorted(inputs)
+
+    def test_binary_resolved_once(self, monkeypatch):
+        """Test FFmpeg tools are looked up on PATH once and then cached."""
+        import shutil
+
+        from src.video.editor import _binary
+
+        mock_which = Mock(return_value="/opt/ffmpeg/bin/ffprobe")
+        monkeypatch.setattr(shutil, "which", mock_which)
+        _binary.cache_clear()
+        try:
+            assert _binary("ffprobe") == "/opt/ffmpeg/bin/ffprobe"
+            assert _binary("ffprobe") == "/opt/ffmpeg/bin/ffprobe"
+            assert mock_which.call_count == 1
+
+            mock_which.return_value = None
+            assert _binary("ffmpeg") == "ffmpeg"
+        finally:
+            _binary.cache_clear()
+
+    def test_assemble_loops_still_image(
+        self,
+        temp_dir,
+        sample_audio_file,
+        sample_ass_file,
+        mock_ffmpeg_probe,
+        mock_ffmpeg_popen,
+    ):
+        """Test an image is looped for the audio duration and tuned for stills."""
+        image = temp_dir / "background.png"
+        image.write_bytes(b"fake_png_data")
+        editor = Editor(workspace=temp_dir, encoder="libx264")
+        (temp_dir / "output.mp4").write_bytes(b"fake")
+
+        editor.assemble(
+            ass_path=sample_ass_file,
+            audio_path=sample_audio_file,
+            media_path=image,
+        )
+
+        cmd = mock_ffmpeg_popen.call_args[0][0]
+        image_input = cmd.index(str(image))
+        assert cmd[image_input - 5 : image_input] == [
+            "-loop",
+            "1",
+            "-framerate",
+            "30",
+            "-i",
+        ]
+        assert cmd[cmd.index("-tune") + 1] == "stillimage"
+        assert cmd[cmd.index("-t") + 1] == "30.5"
+
+    def test_run_ffmpeg_parses_progress(self, temp_dir, mock_ffmpeg_popen):
+        """Test the -progress report on stdout is parsed into key/value stats."""
+        editor = Editor(workspace=temp_dir)
+        mock_ffmpeg_popen.stdout = (
+            b"frame=120\nout_time=00:00:04.000000\nspeed=2.5x\nprogress=continue\n"
+            b"frame=300\nout_time=00:00:10.000000\nspeed=2.7x\nprogress=end\n"
+        )
+
+        editor._run_ffmpeg(["ffmpeg", "-progress", "pipe:1", "output.mp4"])
+
+        assert editor.progress["frame"] == "300"
+        assert editor.progress["speed"] == "2.7x"
+        assert editor.progress["progress"] == "end"
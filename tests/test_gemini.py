@@ -2,17 +2,36 @@
 Tests for src.response.Gemini class.
 """
 
+import os
+import threading
+import time
 from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
-
-from src.response import Gemini, QuotaExceededError
+from src.response import Gemini, QuotaExceededError, ResponseCache
+from tests.stubs import MockQuotaError
 
 
 class TestGemini:
     """Test suite for Gemini class."""
 
+    # Plain attribute-only fakes, built once, for responses the tests only read.
+    FAKE_PCM = b"\x00" * 1300
+    FAKE_AUDIO_RESPONSE = SimpleNamespace(
+        candidates=[
+            SimpleNamespace(
+                content=SimpleNamespace(
+                    parts=[SimpleNamespace(inline_data=SimpleNamespace(data=FAKE_PCM))]
+                )
+            )
+        ]
+    )
+    FAKE_TEXT_RESPONSE = SimpleNamespace(
+        text="test", candidates=[SimpleNamespace(content=SimpleNamespace(text="test"))]
+    )
+
     def test_init(self, mock_gemini_client, temp_dir):
         """Test Gemini initialization."""
         gemini = Gemini(client=mock_gemini_client, workspace=temp_dir)
@@ -20,63 +39,31 @@ class TestGemini:
         assert gemini.workspace == Path(temp_dir)
         assert gemini.voice == "Alnilam"
 
-    def test_is_quota_exceeded_true(self, mock_gemini_client, temp_dir):
+    def test_is_quota_exceeded_true(self, gemini):
         """Test quota exceeded detection."""
-        from google.genai.errors import ClientError
-
-        gemini = Gemini(client=mock_gemini_client, workspace=temp_dir)
-
-        class MockClientError(ClientError):
-            def __init__(self):
-                pass
-
-            def __str__(self):
-                return "429 RESOURCE_EXHAUSTED: Quota exceeded"
-
-        error = MockClientError()
+        error = MockQuotaError()
         assert gemini._is_quota_exceeded(error) is True
 
-    def test_is_quota_exceeded_false(self, mock_gemini_client, temp_dir):
+    def test_is_quota_exceeded_false(self, gemini):
         """Test quota not exceeded."""
-        gemini = Gemini(client=mock_gemini_client, workspace=temp_dir)
         error = Exception("Some other error")
         assert gemini._is_quota_exceeded(error) is False
 
-    def test_extract_retry_delay(self, mock_gemini_client, temp_dir):
+    def test_extract_retry_delay(self, gemini):
         """Test extracting retry delay from error."""
-        from google.genai.errors import ClientError
-
-        gemini = Gemini(client=mock_gemini_client, workspace=temp_dir)
-
-        class MockClientError(ClientError):
-            def __init__(self):
-                pass
-
-            def __str__(self):
-                return "Please retry in 30.5s"
-
-        error = MockClientError()
+        error = MockQuotaError("Please retry in 30.5s")
         delay = gemini._extract_retry_delay(error)
         assert delay >= 5.0
         assert delay >= 30.0
 
-    def test_extract_retry_delay_default(self, mock_gemini_client, temp_dir):
+    def test_extract_retry_delay_default(self, gemini):
         """Test default retry delay when not specified."""
-        gemini = Gemini(client=mock_gemini_client, workspace=temp_dir)
         error = Exception("Some error")
         delay = gemini._extract_retry_delay(error)
         assert delay == 60.0
 
-    def test_get_audio_success(self, mock_gemini_client, temp_dir):
+    def test_get_audio_success(self, gemini, mock_gemini_client):
         """Test successful audio generation."""
-        gemini = Gemini(client=mock_gemini_client, workspace=temp_dir)
-
-        mock_audio_response = MagicMock()
-        mock_part = MagicMock()
-        mock_part.inline_data.data = b"fake_pcm_data" * 100
-        mock_candidate = MagicMock()
-        mock_candidate.content.parts = [mock_part]
-        mock_audio_response.candidates = [mock_candidate]
 
         def generate_content_side_effect(model, contents, config=None):
             if (
@@ -84,14 +71,8 @@ class TestGemini:
                 and hasattr(config, "response_modalities")
                 and "AUDIO" in str(config.response_modalities)
             ):
-                return mock_audio_response
-            # Default text response
-            mock_text_response = MagicMock()
-            mock_text_response.text = "test"
-            mock_text_candidate = MagicMock()
-            mock_text_candidate.content.text = "test"
-            mock_text_response.candidates = [mock_text_candidate]
-            return mock_text_response
+                return self.FAKE_AUDIO_RESPONSE
+            return self.FAKE_TEXT_RESPONSE
 
         mock_gemini_client.models.generate_content.side_effect = (
             generate_content_side_effect
@@ -101,53 +82,34 @@ class TestGemini:
         assert Path(audio_path).exists()
         assert audio_path.endswith(".wav")
 
-    def test_get_audio_empty_transcript(self, mock_gemini_client, temp_dir):
+    def test_get_audio_empty_transcript(self, gemini):
         """Test audio generation with empty transcript."""
-        gemini = Gemini(client=mock_gemini_client, workspace=temp_dir)
         with pytest.raises(ValueError, match="Transcript must be a non-empty string"):
             gemini.get_audio("")
 
     @patch("src.response.gemini.time.sleep")
-    def test_get_audio_quota_exceeded(self, mock_sleep, mock_gemini_client, temp_dir):
+    def test_get_audio_quota_exceeded(self, mock_sleep, gemini, mock_gemini_client):
         """Test audio generation with quota exceeded."""
-        from google.genai.errors import ClientError
-
-        gemini = Gemini(client=mock_gemini_client, workspace=temp_dir)
-
-        class MockClientError(ClientError):
-            def __init__(self):
-                pass
-
-            def __str__(self):
-                return "429 RESOURCE_EXHAUSTED: Quota exceeded"
-
-        error = MockClientError()
+        error = MockQuotaError()
         mock_gemini_client.models.generate_content.side_effect = error
 
         with pytest.raises(QuotaExceededError):
             gemini.get_audio("Test transcript")
 
-    def test_get_response_success(self, mock_gemini_client, temp_dir):
+    def test_get_response_success(self, gemini):
         """Test successful text response generation."""
-        gemini = Gemini(client=mock_gemini_client, workspace=temp_dir)
-
         response = gemini.get_response("test query", model="2.5")
         assert response is not None
         assert "TRANSCRIPT" in response or len(response) > 0
 
-    def test_get_response_model_not_found(self, mock_gemini_client, temp_dir):
+    def test_get_response_model_not_found(self, gemini):
         """Test response with invalid model."""
-        gemini = Gemini(client=mock_gemini_client, workspace=temp_dir)
         result = gemini.get_response("test", model="9.9")
         assert result is None
 
     @patch("src.response.gemini.time.sleep")
-    def test_get_response_fallback_model(
-        self, mock_sleep, mock_gemini_client, temp_dir
-    ):
+    def test_get_response_fallback_model(self, mock_sleep, gemini, mock_gemini_client):
         """Test model fallback on failure."""
-        gemini = Gemini(client=mock_gemini_client, workspace=temp_dir)
-
         # First call fails, second succeeds
         call_count = 0
 
@@ -171,23 +133,128 @@ class TestGemini:
         assert response is not None or True  # May fail with RuntimeError
 
     @patch("src.response.gemini.time.sleep")
-    def test_get_response_quota_exceeded(
-        self, mock_sleep, mock_gemini_client, temp_dir
-    ):
+    def test_get_response_quota_exceeded(self, mock_sleep, gemini, mock_gemini_client):
         """Test response generation with quota exceeded."""
-        from google.genai.errors import ClientError
+        error = MockQuotaError()
+        mock_gemini_client.models.generate_content.side_effect = error
 
-        gemini = Gemini(client=mock_gemini_client, workspace=temp_dir)
+        with pytest.raises(QuotaExceededError):
+            gemini.get_response("test query", model="2.5")
 
-        class MockClientError(ClientError):
-            def __init__(self):
-                pass
+    def test_get_response_cache_hit(self, mock_gemini_client, temp_dir):
+        """Test a repeated prompt is served from the cache without an API call."""
+        gemini = Gemini(
+            client=mock_gemini_client,
+            workspace=temp_dir,
+            cache=ResponseCache(temp_dir / ".llm-cache"),
+        )
 
-            def __str__(self):
-                return "429 RESOURCE_EXHAUSTED: Quota exceeded"
+        first = gemini.get_response("test query", model="2.5")
+        second = gemini.get_response("test query", model="2.5")
+
+        assert second == first
+        assert mock_gemini_client.models.generate_content.call_count == 1
+
+        gemini.get_response("another query", model="2.5")
+        assert mock_gemini_client.models.generate_content.call_count == 2
+
+    def test_response_cache_expires(self, temp_dir):
+        """Test cache entries older than the TTL are treated as misses."""
+        cache = ResponseCache(temp_dir, ttl=3600)
+        cache.set("gemini-2.5-flash", "prompt", "text")
+        assert cache.get("gemini-2.5-flash", "prompt") == "text"
+
+        entry = temp_dir / f"{ResponseCache.key('gemini-2.5-flash', 'prompt')}.json"
+        stale = time.time() - 7200
+        os.utime(entry, (stale, stale))
+        assert cache.get("gemini-2.5-flash", "prompt") is None
+
+    def test_response_cache_concurrent_writes(self, temp_dir):
+        """Test threads writing the same key never clobber a shared temp file."""
+        cache = ResponseCache(temp_dir)
+        texts = [f"text {i}" for i in range(8)]
+        threads = [
+            threading.Thread(target=cache.set, args=("model", "prompt", text))
+            for text in texts
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert cache.get("model", "prompt") in texts
+        assert not list(temp_dir.glob("*.tmp"))
+
+    @patch("src.response.gemini.random.uniform", return_value=1.0)
+    @patch("src.response.gemini.time.sleep")
+    def test_backoff_grows_exponentially(
+        self, mock_sleep, mock_uniform, gemini, mock_gemini_client
+    ):
+        """Test successive retry sleeps at least double until the cap."""
+        mock_gemini_client.models.generate_content.side_effect = Exception("boom")
 
-        error = MockClientError()
-        mock_gemini_client.models.generate_content.side_effect = error
+        with pytest.raises(RuntimeError, match="All Gemini models failed"):
+            gemini.get_response("test", model="2.0", max_retries=4)
 
-        with pytest.raises(QuotaExceededError):
-            gemini.get_response("test query", model="2.5")
+        delays = [call.args[0] for call in mock_sleep.call_args_list]
+        assert delays == [2.0, 4.0, 8.0, 16.0]
+        assert gemini._backoff_delay(10) == 60.0
+
+    @patch("src.response.gemini.time.sleep")
+    def test_get_response_rate_limit_honours_retry_hint(
+        self, mock_sleep, gemini, mock_gemini_client
+    ):
+        """Test a 429 with a server retry hint is retried after at least that delay."""
+        success = MagicMock(text="Success")
+        mock_gemini_client.models.generate_content.side_effect = [
+            MockQuotaError("429 RESOURCE_EXHAUSTED: Please retry in 30.5s"),
+            success,
+        ]
+
+        assert gemini.get_response("test", model="2.5") == "Success"
+        assert mock_sleep.call_args.args[0] >= 30.5
+
+    async def test_aget_response_success(self, gemini, mock_gemini_client):
+        """Test async text generation goes through the native async client."""
+        mock_gemini_client.aio.models.generate_content = AsyncMock(
+            return_value=self.FAKE_TEXT_RESPONSE
+        )
+
+        response = await gemini.aget_response("test query", model="2.5")
+
+        assert response == "test"
+        mock_gemini_client.aio.models.generate_content.assert_awaited_once()
+        assert not mock_gemini_client.models.generate_content.called
+
+    async def test_aget_response_cache_hit(self, mock_gemini_client, temp_dir):
+        """Test the async path uses the cache and writes it off the event loop."""
+        mock_gemini_client.aio.models.generate_content = AsyncMock(
+            return_value=self.FAKE_TEXT_RESPONSE
+        )
+        cache = ResponseCache(temp_dir / ".llm-cache")
+        write_threads = []
+        cache_set = cache.set
+
+        def recording_set(*args):
+            write_threads.append(threading.get_ident())
+            cache_set(*args)
+
+        cache.set = recording_set
+        gemini = Gemini(client=mock_gemini_client, workspace=temp_dir, cache=cache)
+
+        first = await gemini.aget_response("test query", model="2.5")
+        assert await gemini.aget_response("test query", model="2.5") == first
+        mock_gemini_client.aio.models.generate_content.assert_awaited_once()
+        assert len(write_threads) == 1
+        assert write_threads[0] != threading.get_ident()
+
+    async def test_aget_audio_success(self, gemini, mock_gemini_client):
+        """Test async audio generation saves the returned PCM as WAV."""
+        mock_gemini_client.aio.models.generate_content = AsyncMock(
+            return_value=self.FAKE_AUDIO_RESPONSE
+        )
+
+        audio_path = await gemini.aget_audio("Test transcript")
+
+        assert Path(audio_path).exists()
+        assert audio_path.endswith(".wav")
@@ -0,0 +1,36 @@
+"""
+Throughput regression tests for the Gemini 429 handling helpers.
+
+Skipped unless pytest runs with `--benchmark-only` (see conftest.py); see
+docs/TESTING.md for saving a baseline and comparing against it.
+"""
+
+import pytest
+
+from tests.stubs import MockQuotaError
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.mark.slow
+def test_extract_retry_delay_perf(benchmark, gemini):
+    """Benchmark retry delay extraction from a 429 error message."""
+    error = MockQuotaError("429 RESOURCE_EXHAUSTED: Please retry in 30.5s")
+
+    delay = benchmark.pedantic(
+        gemini._extract_retry_delay, args=(error,), rounds=1000, iterations=100
+    )
+
+    assert delay >= 30.5
+
+
+@pytest.mark.slow
+def test_is_quota_exceeded_perf(benchmark, gemini):
+    """Benchmark quota error detection."""
+    error = MockQuotaError()
+
+    result = benchmark.pedantic(
+        gemini._is_quota_exceeded, args=(error,), rounds=1000, iterations=100
+    )
+
+    assert result is True
@@ -2,14 +2,21 @@
 Tests for main.py functionality.
 """
 
+import datetime
 import os
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from src.core.app import Core, get_channel_name_from_preset, get_version
 
+PRESET_NO_API = "NAME: test\n"
+PRESET_NO_UPLOAD = "NAME: test\nUPLOAD: false\nGEMINI_API_KEY: test_key\n"
+PRESET_UPLOAD = "NAME: test\nGEMINI_API_KEY: test_key\n"
+PRESET_NO_NAME = "OTHER: value\n"
+
 
 class TestMainFunctions:
     """Test suite for main.py utility functions."""
@@ -20,6 +27,12 @@ class TestMainFunctions:
         assert version is not None
         assert isinstance(version, str)
         assert "." in version  # Should be semver format
+        assert get_version() is version
+
+    def test_get_version_prefers_installed_metadata(self):
+        """Test that installed package metadata is used before pyproject.toml."""
+        with patch("src.core.app.metadata.version", return_value="9.9.9"):
+            assert get_version.__wrapped__() == "9.9.9"
 
     def test_get_channel_name_from_preset_success(self, temp_preset_file):
         """Test getting channel name from valid preset."""
@@ -35,10 +48,7 @@ class TestMainFunctions:
     def test_get_channel_name_from_preset_no_name_field(self, temp_dir):
         """Test getting channel name when NAME field is missing."""
         preset_path = temp_dir / "no_name.yml"
-        import yaml
-
-        with preset_path.open("w", encoding="utf-8") as f:
-            yaml.safe_dump({"OTHER": "value"}, f)
+        preset_path.write_text(PRESET_NO_NAME, encoding="utf-8")
 
         name = get_channel_name_from_preset(str(preset_path))
         assert name == "crank"  # Default
@@ -47,34 +57,10 @@ class TestMainFunctions:
 class TestCore:
     """Test suite for Core class."""
 
-    @patch("src.core.app.Uploader")
-    @patch("src.core.app.Editor")
-    @patch("src.core.app.Handler")
-    @patch("src.core.app.Gemini")
-    @patch("src.core.app.PluginRegistry")
-    @patch("src.core.app.Orchestrator")
-    @patch("src.core.app.genai.Client")
-    def test_init_success(
-        self,
-        mock_client_class,
-        mock_orchestrator_class,
-        mock_plugin_registry_class,
-        mock_gemini_class,
-        mock_handler_class,
-        mock_editor_class,
-        mock_uploader_class,
-        temp_preset_file,
-        temp_dir,
-    ):
+    def test_init_success(self, core_patches, temp_preset_file, temp_dir):
         """Test Core initialization with valid preset."""
         mock_client = MagicMock()
-        mock_client_class.return_value = mock_client
-
-        mock_plugin_registry = MagicMock()
-        mock_plugin = MagicMock()
-        mock_plugin_registry.has_plugin.return_value = True
-        mock_plugin_registry.get_plugin.return_value = mock_plugin
-        mock_plugin_registry_class.return_value = mock_plugin_registry
+        core_patches.client_class.return_value = mock_client
 
         core = Core(workspace=str(temp_dir), path=str(temp_preset_file))
 
@@ -84,36 +70,11 @@ class TestCore:
         assert core.client == mock_client
         assert core.is_running is True
 
-    @patch("src.core.app.Uploader")
-    @patch("src.core.app.Editor")
-    @patch("src.core.app.Handler")
-    @patch("src.core.app.Gemini")
-    @patch("src.core.app.PluginRegistry")
-    @patch("src.core.app.Orchestrator")
-    @patch("src.core.app.genai.Client")
-    def test_init_no_api_key(
-        self,
-        mock_client_class,
-        mock_orchestrator_class,
-        mock_plugin_registry_class,
-        mock_gemini_class,
-        mock_handler_class,
-        mock_editor_class,
-        mock_uploader_class,
-        temp_dir,
-    ):
+    def test_init_no_api_key(self, core_patches, temp_dir):
         """Test Core initialization without API key."""
-        mock_plugin_registry = MagicMock()
-        mock_plugin = MagicMock()
-        mock_plugin_registry.has_plugin.return_value = True
-        mock_plugin_registry.get_plugin.return_value = mock_plugin
-        mock_plugin_registry_class.return_value = mock_plugin_registry
         # Create preset without API key
         preset_path = temp_dir / "no_api.yml"
-        import yaml
-
-        with preset_path.open("w", encoding="utf-8") as f:
-            yaml.safe_dump({"NAME": "test"}, f)
+        preset_path.write_text(PRESET_NO_API, encoding="utf-8")
 
         # Ensure env var is not set
         with patch.dict(os.environ, {}, clear=False):
@@ -123,119 +84,75 @@ class TestCore:
             with pytest.raises(RuntimeError, match="GEMINI_API_KEY not found"):
                 Core(workspace=str(temp_dir), path=str(preset_path))
 
-    @patch("src.core.app.Uploader")
-    @patch("src.core.app.Editor")
-    @patch("src.core.app.Handler")
-    @patch("src.core.app.Gemini")
-    @patch("src.core.app.PluginRegistry")
-    @patch("src.core.app.Orchestrator")
-    @patch("src.core.app.genai.Client")
-    def test_init_upload_disabled(
-        self,
-        mock_client_class,
-        mock_orchestrator_class,
-        mock_plugin_registry_class,
-        mock_gemini_class,
-        mock_handler_class,
-        mock_editor_class,
-        mock_uploader_class,
-        temp_dir,
-    ):
+    def test_init_upload_disabled(self, core_patches, temp_dir):
         """Test Core initialization with upload disabled."""
         preset_path = temp_dir / "no_upload.yml"
-        import yaml
-
-        with preset_path.open("w", encoding="utf-8") as f:
-            yaml.safe_dump(
-                {
-                    "NAME": "test",
-                    "UPLOAD": False,
-                    "GEMINI_API_KEY": "test_key",
-                },
-                f,
-            )
+        preset_path.write_text(PRESET_NO_UPLOAD, encoding="utf-8")
 
-        mock_client = MagicMock()
-        mock_client_class.return_value = mock_client
+        core = Core(workspace=str(temp_dir), path=str(preset_path))
+
+        assert core.uploader is None
+        assert core_patches.uploader_class.called is False
+        assert core_patches.editor_class.call_args.kwargs["faststart"] is True
 
-        mock_plugin_registry = MagicMock()
-        mock_plugin = MagicMock()
-        mock_plugin_registry.has_plugin.return_value = True
-        mock_plugin_registry.get_plugin.return_value = mock_plugin
-        mock_plugin_registry_class.return_value = mock_plugin_registry
+    def test_init_upload_enabled(self, core_patches, temp_dir):
+        """Test videos bound for upload are written without the faststart pass."""
+        preset_path = temp_dir / "upload.yml"
+        preset_path.write_text(PRESET_UPLOAD, encoding="utf-8")
 
         core = Core(workspace=str(temp_dir), path=str(preset_path))
 
-        assert core.uploader is None
-        assert mock_uploader_class.called is False
-
-    @patch("src.core.app.Uploader")
-    @patch("src.core.app.Editor")
-    @patch("src.core.app.Handler")
-    @patch("src.core.app.Gemini")
-    @patch("src.core.app.PluginRegistry")
-    @patch("src.core.app.Orchestrator")
-    @patch("src.core.app.genai.Client")
-    def test_time_left_no_limit(
-        self,
-        mock_client_class,
-        mock_orchestrator_class,
-        mock_plugin_registry_class,
-        mock_gemini_class,
-        mock_handler_class,
-        mock_editor_class,
-        mock_uploader_class,
-        temp_preset_file,
-        temp_dir,
-    ):
+        assert core.uploader is core_patches.uploader_class.return_value
+        assert core_patches.editor_class.call_args.kwargs["faststart"] is False
+
+    def test_init_response_cache_disabled(self, core_patches, temp_dir):
+        """Test Gemini gets no response cache unless the preset asks for one."""
+        preset_path = temp_dir / "no_upload.yml"
+        preset_path.write_text(PRESET_NO_UPLOAD, encoding="utf-8")
+
+        core = Core(workspace=str(temp_dir), path=str(preset_path))
+
+        assert core.response_cache is None
+        assert core_patches.gemini_class.call_args.kwargs["cache"] is None
+
+    def test_init_response_cache_enabled(self, core_patches, temp_dir):
+        """Test GEMINI_CACHE_DIR and GEMINI_CACHE_TTL configure the response cache."""
+        cache_dir = temp_dir / "llm-cache"
+        preset_path = temp_dir / "cache.yml"
+        preset_path.write_text(
+            PRESET_NO_UPLOAD + f"GEMINI_CACHE_DIR: {cache_dir}\nGEMINI_CACHE_TTL: 60\n",
+            encoding="utf-8",
+        )
+
+        core = Core(workspace=str(temp_dir), path=str(preset_path))
+
+        cache = core_patches.gemini_class.call_args.kwargs["cache"]
+        assert cache is core.response_cache
+        assert cache.directory == cache_dir
+        assert cache.ttl == 60.0
+        assert cache_dir.is_dir()
+
+    def test_time_left_no_limit(self):
         """Test _time_left when no limit is set."""
-        mock_client = MagicMock()
-        mock_client_class.return_value = mock_client
+        stub = SimpleNamespace(
+            preset=SimpleNamespace(get=lambda key, default=None: default)
+        )
+        assert Core._time_left(stub) == 0
 
-        mock_plugin_registry = MagicMock()
-        mock_plugin = MagicMock()
-        mock_plugin_registry.has_plugin.return_value = True
-        mock_plugin_registry.get_plugin.return_value = mock_plugin
-        mock_plugin_registry_class.return_value = mock_plugin_registry
+    def test_time_left_recent_limit(self):
+        """Test _time_left counts down from a recently recorded limit."""
+        limit_time = datetime.datetime.now(datetime.UTC).isoformat()
+        stub = SimpleNamespace(preset=SimpleNamespace(get=lambda key: limit_time))
+        assert 0 < Core._time_left(stub, num_hours=1) <= 3600
 
-        core = Core(workspace=str(temp_dir), path=str(temp_preset_file))
-        time_left = core._time_left()
-        assert time_left == 0
-
-    @patch("src.core.app.Uploader")
-    @patch("src.core.app.Editor")
-    @patch("src.core.app.Handler")
-    @patch("src.core.app.Gemini")
-    @patch("src.core.app.PluginRegistry")
-    @patch("src.core.app.Orchestrator")
-    @patch("src.core.app.genai.Client")
-    @pytest.mark.asyncio
     async def test_run_keyboard_interrupt(
-        self,
-        mock_client_class,
-        mock_orchestrator_class,
-        mock_plugin_registry_class,
-        mock_gemini_class,
-        mock_handler_class,
-        mock_editor_class,
-        mock_uploader_class,
-        temp_preset_file,
-        temp_dir,
+        self, core_patches, temp_preset_file, temp_dir
     ):
         """Test handling of KeyboardInterrupt in run loop."""
-        mock_client = MagicMock()
-        mock_client_class.return_value = mock_client
-
-        mock_plugin_registry = MagicMock()
-        mock_plugin = MagicMock()
-        mock_plugin_registry.has_plugin.return_value = True
-        mock_plugin_registry.get_plugin.return_value = mock_plugin
-        mock_plugin_registry_class.return_value = mock_plugin_registry
-
         mock_orchestrator = MagicMock()
         mock_orchestrator.process = AsyncMock()
         mock_orchestrator.process.side_effect = KeyboardInterrupt()
-        mock_orchestrator_class.return_value = mock_orchestrator
+        core_patches.orchestrator_class.return_value = mock_orchestrator
 
         core = Core(workspace=str(temp_dir), path=str(temp_preset_file))
 
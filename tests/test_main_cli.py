@@ -15,48 +15,26 @@ from src.core.app import ArgumentParser
 class TestCLI:
     """Test suite for CLI argument parsing and environment variable handling."""
 
-    def test_path_argument_priority(self, temp_dir, monkeypatch):
-        """Test that --path argument takes priority over PRESET_PATH env var."""
-        preset1 = temp_dir / "preset1.yml"
-        preset2 = temp_dir / "preset2.yml"
-        preset1.write_text("NAME: preset1")
-        preset2.write_text("NAME: preset2")
+    @pytest.mark.parametrize(
+        "cli_path, env_path, expected",
+        [
+            ("preset2.yml", "preset1.yml", "preset2.yml"),  # --path wins
+            (None, "preset_env.yml", "preset_env.yml"),  # env var fallback
+            (None, None, "config/preset.yml"),  # default
+        ],
+    )
+    def test_preset_path_resolution(self, monkeypatch, cli_path, env_path, expected):
+        """Test --path, PRESET_PATH and default preset path precedence."""
+        if env_path:
+            monkeypatch.setenv("PRESET_PATH", env_path)
+        else:
+            monkeypatch.delenv("PRESET_PATH", raising=False)
 
-        # Set environment variable
-        monkeypatch.setenv("PRESET_PATH", str(preset1))
-
-        # Simulate argparse
-        args = Mock()
-        args.path = str(preset2)
-        result_path = args.path or os.environ.get("PRESET_PATH", "config/preset.yml")
-
-        assert result_path == str(preset2)  # --path should win
-
-    def test_preset_path_env_var(self, temp_dir, monkeypatch):
-        """Test PRESET_PATH environment variable fallback."""
-        preset = temp_dir / "preset_env.yml"
-        preset.write_text("NAME: env_preset")
-
-        monkeypatch.setenv("PRESET_PATH", str(preset))
-
-        # Simulate no --path argument
         args = Mock()
-        args.path = None
-
-        result_path = args.path or os.environ.get("PRESET_PATH", "config/preset.yml")
-
-        assert result_path == str(preset)
-
-    def test_default_preset_path(self, monkeypatch):
-        """Test default preset path when neither argument nor env var is set."""
-        monkeypatch.delenv("PRESET_PATH", raising=False)
-
-        args = Mock()
-        args.path = None
-
+        args.path = cli_path
         result_path = args.path or os.environ.get("PRESET_PATH", "config/preset.yml")
 
-        assert result_path == "config/preset.yml"
+        assert result_path == expected
 
     @patch("src.core.app.setup_logging")
     @patch("src.core.app.get_channel_name_from_preset")
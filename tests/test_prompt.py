@@ -2,27 +2,36 @@
 Tests for prompt.Prompt class.
 """
 
+import functools
+from pathlib import Path
+from typing import Dict, Tuple
+
 import pytest
+from src.preset import YmlHandler
 from src.prompt import Prompt
 
 
+@functools.lru_cache(maxsize=None)
+def _load_prompts(path_str: str) -> Tuple[YmlHandler, Dict[str, str]]:
+    """Parse a prompt file and build its output format once; Prompt only reads both."""
+    prompts = YmlHandler(Path(path_str))
+    output_format = {
+        "TRANSCRIPT": prompts.get("GET_CONTENT", ""),
+        "DESCRIPTION": prompts.get("GET_DESCRIPTION", ""),
+        "SEARCH_TERM": prompts.get("GET_SEARCH_TERM", ""),
+        "TITLE": prompts.get("GET_TITLE", ""),
+        "CATEGORY_ID": prompts.get("GET_CATEGORY_ID", ""),
+    }
+    return prompts, output_format
+
+
 @pytest.fixture
 def prompt_handler(temp_prompt_file, monkeypatch):
     """Create a Prompt instance with test prompt file."""
-    # Monkeypatch the default prompt.yml path
-    original_init = Prompt.__init__
 
+    # Monkeypatch the default prompt.yml path
     def patched_init(self):
-        self.prompts = __import__("preset", fromlist=["YmlHandler"]).YmlHandler(
-            temp_prompt_file
-        )
-        self.output_format = {
-            "TRANSCRIPT": self.prompts.get("GET_CONTENT", ""),
-            "DESCRIPTION": self.prompts.get("GET_DESCRIPTION", ""),
-            "SEARCH_TERM": self.prompts.get("GET_SEARCH_TERM", ""),
-            "TITLE": self.prompts.get("GET_TITLE", ""),
-            "CATEGORY_ID": self.prompts.get("GET_CATEGORY_ID", ""),
-        }
+        self.prompts, self.output_format = _load_prompts(str(temp_prompt_file))
 
     monkeypatch.setattr(Prompt, "__init__", patched_init)
     return Prompt()
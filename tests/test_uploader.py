@@ -3,351 +3,232 @@ Tests for youtube.Uploader class.
 """
 
 import datetime
+import os
+from contextlib import ExitStack
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 import pytest
 from google.auth.exceptions import RefreshError
 from google.oauth2.credentials import Credentials
 from googleapiclient.http import ResumableUploadError
 from src.youtube import Uploader
+from tests.stubs import forbidden_upload_error, set_upload_result
 
 
-class TestUploader:
-    """Test suite for Uploader class."""
+def _path_exists(path):
+    """Path.exists stand-in reporting the OAuth secrets and token files as present."""
+    path_str = str(path)
+    if path_str.endswith(("secrets.json", "token.json")):
+        return True
+    return os.path.exists(path_str)
 
-    @patch("src.youtube.uploader.InstalledAppFlow")
-    @patch("src.youtube.uploader.build")
-    def test_init_success(self, mock_build, mock_flow_class, temp_dir):
-        """Test successful Uploader initialization."""
-        secrets_file = temp_dir / "secrets.json"
-        secrets_file.write_text(
-            '{"installed": {"client_id": "test", "client_secret": "secret", "auth_uri": "https://accounts.google.com/o/oauth2/auth", "token_uri": "https://oauth2.googleapis.com/token"}}'
-        )
 
-        mock_credentials = MagicMock(spec=Credentials)
-        mock_credentials.valid = True
-        mock_credentials.to_json.return_value = '{"token": "fake_token"}'
-        mock_flow_instance = MagicMock()
-        mock_flow_instance.run_local_server = MagicMock(return_value=mock_credentials)
-        mock_flow_class.from_client_secrets_file.return_value = mock_flow_instance
-        mock_build.return_value = MagicMock()
+@pytest.fixture(autouse=True)
+def _isolated_cwd(temp_dir, monkeypatch):
+    """Run in tmp_path so the .tokens folder Uploader writes stays out of the repo."""
+    monkeypatch.chdir(temp_dir)
 
-        token_dir = temp_dir / ".tokens"
-        token_dir.mkdir(exist_ok=True)
 
-        secrets_path_str = str(secrets_file)
+@pytest.fixture(autouse=True)
+def _fake_oauth_files(monkeypatch):
+    """Install the Path.exists stand-in once per test instead of per call site."""
+    monkeypatch.setattr(Path, "exists", _path_exists)
 
-        def path_exists(self):
-            path_str = str(self)
-            import os
 
-            if path_str == secrets_path_str:
-                return os.path.exists(secrets_path_str)
-            return str(self).endswith("token.json")
+@pytest.fixture(autouse=True)
+def _fresh_service_cache(monkeypatch):
+    """Start every test without API clients cached by earlier tests."""
+    monkeypatch.setattr(Uploader, "_service_cache", {})
 
-        with (
-            patch.object(Path, "exists", path_exists),
-            patch("src.youtube.uploader.Credentials") as mock_creds_class,
-        ):
-            mock_creds_class.from_authorized_user_file.return_value = mock_credentials
-            uploader = Uploader(name="test", auth_token=secrets_path_str)
-            assert uploader.name == "test"
-            assert uploader.secrets_file == secrets_file
 
-    def test_init_secrets_file_not_found(self, temp_dir):
-        """Test Uploader initialization with missing secrets file."""
-        fake_secrets = temp_dir / "nonexistent.json"
+@pytest.fixture
+def video_file(temp_dir):
+    """Create a small placeholder video file."""
+    video_path = temp_dir / "test_video.mp4"
+    video_path.write_bytes(b"fake_video_data")
+    return video_path
 
-        with pytest.raises(FileNotFoundError, match="OAuth secrets file not found"):
-            Uploader(name="test", auth_token=str(fake_secrets))
 
-    @patch("src.youtube.uploader.InstalledAppFlow")
-    @patch("src.youtube.uploader.build", return_value=None)
-    def test_upload_success(
-        self, mock_build, mock_flow_class, temp_dir, mock_youtube_service
-    ):
-        """Test successful video upload."""
-        secrets_file = temp_dir / "secrets.json"
-        secrets_file.write_text(
-            '{"installed": {"client_id": "test", "client_secret": "secret", "auth_uri": "https://accounts.google.com/o/oauth2/auth", "token_uri": "https://oauth2.googleapis.com/token"}}'
+@pytest.fixture(scope="class")
+def _oauth_patch_stack():
+    """Patch the OAuth and API client collaborators of `Uploader`, once per class."""
+    targets = {
+        "flow_class": "src.youtube.uploader.InstalledAppFlow",
+        "credentials_class": "src.youtube.uploader.Credentials",
+        "request_class": "src.youtube.uploader.Request",
+        "build": "src.youtube.uploader.build",
+    }
+    with ExitStack() as stack:
+        yield SimpleNamespace(
+            **{
+                name: stack.enter_context(patch(target))
+                for name, target in targets.items()
+            }
         )
-        video_file = temp_dir / "test_video.mp4"
-        video_file.write_bytes(b"fake_video_data")
 
-        mock_build.return_value = mock_youtube_service
 
-        mock_credentials = MagicMock(spec=Credentials)
-        mock_credentials.valid = True
-        mock_credentials.to_json.return_value = '{"token": "fake_token"}'
+@pytest.fixture
+def oauth_patches(
+    _oauth_patch_stack, mock_flow, mock_credentials, mock_youtube_service
+):
+    """Class-wide OAuth patches, reset for each test.
 
-        mock_flow_instance = MagicMock()
-        mock_flow_instance.run_local_server = MagicMock(return_value=mock_credentials)
-        mock_flow_class.from_client_secrets_file.return_value = mock_flow_instance
+    Stored credentials load as valid and the API client is the mock YouTube service.
+    """
+    for mock in vars(_oauth_patch_stack).values():
+        mock.reset_mock(return_value=True, side_effect=True)
 
-        token_file = temp_dir / ".tokens" / "test_token.json"
-        token_file.parent.mkdir(exist_ok=True)
-        token_file.write_text(
-            '{"token": "fake_token", "refresh_token": "fake_refresh", "client_id": "test", "client_secret": "secret", "token_uri": "https://oauth2.googleapis.com/token"}'
-        )
+    _oauth_patch_stack.flow_class.from_client_secrets_file.return_value = mock_flow
+    credentials_class = _oauth_patch_stack.credentials_class
+    credentials_class.from_authorized_user_file.return_value = mock_credentials
+    _oauth_patch_stack.build.return_value = mock_youtube_service
+    return _oauth_patch_stack
 
-        secrets_path_str = str(secrets_file)
-
-        def path_exists_mock(self):
-            path_str = str(self)
-            import os
-
-            if path_str == secrets_path_str:
-                return os.path.exists(secrets_path_str)
-            if "token" in path_str:
-                return (
-                    os.path.exists(path_str)
-                    if os.path.exists(os.path.dirname(path_str))
-                    else True
-                )
-            return False
-
-        with (
-            patch.object(Path, "exists", path_exists_mock),
-            patch("src.youtube.uploader.Credentials") as mock_creds_class,
-        ):
-            mock_creds_class.from_authorized_user_file.return_value = mock_credentials
-            uploader = Uploader(name="test", auth_token=secrets_path_str)
-            uploader.service = mock_youtube_service
-
-            video_data = {
-                "video_path": video_file,
-                "title": "Test Video",
-                "description": "Test Description",
-                "categoryId": 24,
-                "delay": 0,
-                "last_upload": None,
-            }
 
-            mock_response = {"id": "test_video_id"}
-            mock_youtube_service.videos.return_value.insert.return_value.execute.return_value = mock_response
+@pytest.fixture
+def authed_uploader(temp_dir, oauth_patches):
+    """Create an Uploader authenticated with mocked OAuth and YouTube services."""
+    return Uploader(name="test", auth_token=str(temp_dir / "secrets.json"))
 
-            url, scheduled = uploader.upload(video_data)
-            assert url is not None
-            assert "youtube.com" in url or "test_video_id" in url
 
-    @patch("src.youtube.uploader.InstalledAppFlow")
-    @patch("src.youtube.uploader.build", return_value=None)
-    def test_upload_with_scheduling(
-        self, mock_build, mock_flow_class, temp_dir, mock_youtube_service
-    ):
-        """Test video upload with scheduling."""
-        secrets_file = temp_dir / "secrets.json"
-        secrets_file.write_text(
-            '{"installed": {"client_id": "test", "client_secret": "secret", "auth_uri": "https://accounts.google.com/o/oauth2/auth", "token_uri": "https://oauth2.googleapis.com/token"}}'
-        )
-        video_file = temp_dir / "test_video.mp4"
-        video_file.write_bytes(b"fake_video_data")
+class TestUploader:
+    """Test suite for Uploader class."""
 
-        mock_build.return_value = mock_youtube_service
+    def test_init_success(self, authed_uploader, temp_dir):
+        """Test successful Uploader initialization."""
+        assert authed_uploader.name == "test"
+        assert authed_uploader.secrets_file == temp_dir / "secrets.json"
 
-        mock_credentials = MagicMock(spec=Credentials)
-        mock_credentials.valid = True
-        mock_credentials.to_json.return_value = '{"token": "fake_token"}'
+    def test_init_reuses_cached_service(self, authed_uploader, oauth_patches, temp_dir):
+        """Test a second Uploader for the same channel skips authentication."""
+        second = Uploader(name="test", auth_token=str(temp_dir / "secrets.json"))
 
-        mock_flow_instance = MagicMock()
-        mock_flow_instance.run_local_server = MagicMock(return_value=mock_credentials)
-        mock_flow_class.from_client_secrets_file.return_value = mock_flow_instance
+        assert second.service is authed_uploader.service
+        assert second.credentials is None
+        oauth_patches.build.assert_called_once()
 
-        secrets_path_str = str(secrets_file)
-        token_file = temp_dir / ".tokens" / "test_token.json"
-        token_file.parent.mkdir(exist_ok=True)
-        token_file.write_text(
-            '{"token": "fake_token", "refresh_token": "fake_refresh", "client_id": "test", "client_secret": "secret", "token_uri": "https://oauth2.googleapis.com/token"}'
-        )
+    def test_init_secrets_file_not_found(self, temp_dir):
+        """Test Uploader initialization with missing secrets file."""
+        fake_secrets = temp_dir / "nonexistent.json"
 
-        def path_exists_token(self):
-            path_str = str(self)
-            import os
-
-            if path_str == secrets_path_str:
-                return os.path.exists(secrets_path_str)
-            if "token" in path_str:
-                return (
-                    os.path.exists(path_str)
-                    if os.path.exists(os.path.dirname(path_str))
-                    else True
-                )
-            return False
-
-        with (
-            patch.object(Path, "exists", path_exists_token),
-            patch("src.youtube.uploader.Credentials") as mock_creds_class,
-        ):
-            mock_creds_class.from_authorized_user_file.return_value = mock_credentials
-            uploader = Uploader(name="test", auth_token=secrets_path_str)
-            uploader.service = mock_youtube_service
+        with pytest.raises(FileNotFoundError, match="OAuth secrets file not found"):
+            Uploader(name="test", auth_token=str(fake_secrets))
 
+    @pytest.mark.parametrize(
+        "delay, hours_since_last_upload, expect_publish_at",
+        [
+            (0, None, False),  # Publish immediately
+            (2, 1, True),  # Scheduled two hours after the last upload
+        ],
+    )
+    def test_upload(
+        self,
+        authed_uploader,
+        mock_youtube_service,
+        video_file,
+        delay,
+        hours_since_last_upload,
+        expect_publish_at,
+    ):
+        """Test video upload with and without scheduling."""
+        last_upload = None
+        if hours_since_last_upload is not None:
             last_upload = datetime.datetime.now(datetime.UTC) - datetime.timedelta(
-                hours=1
+                hours=hours_since_last_upload
             )
-            video_data = {
+        set_upload_result(mock_youtube_service, {"id": "test_video_id"})
+
+        url, scheduled = authed_uploader.upload(
+            {
                 "video_path": video_file,
                 "title": "Test Video",
                 "description": "Test Description",
                 "categoryId": 24,
-                "delay": 2,
+                "delay": delay,
                 "last_upload": last_upload,
             }
+        )
 
-            mock_response = {"id": "test_video_id"}
-            mock_youtube_service.videos.return_value.insert.return_value.execute.return_value = mock_response
-
-            url, scheduled = uploader.upload(video_data)
-            assert scheduled is not None
+        assert url == "https://www.youtube.com/watch?v=test_video_id"
+        insert = mock_youtube_service.videos.return_value.insert
+        status = insert.call_args.kwargs["body"]["status"]
+        assert ("publishAt" in status) is expect_publish_at
+        if last_upload is not None:
             assert scheduled > last_upload
 
-    @patch("src.youtube.uploader.InstalledAppFlow")
-    @patch("src.youtube.uploader.build", return_value=None)
     def test_upload_resumable_error(
-        self, mock_build, mock_flow_class, temp_dir, mock_youtube_service
+        self, authed_uploader, mock_youtube_service, video_file
     ):
-        """Test handling of ResumableUploadError."""
-        secrets_file = temp_dir / "secrets.json"
-        secrets_file.write_text(
-            '{"installed": {"client_id": "test", "client_secret": "secret", "auth_uri": "https://accounts.google.com/o/oauth2/auth", "token_uri": "https://oauth2.googleapis.com/token"}}'
-        )
-        video_file = temp_dir / "test_video.mp4"
-        video_file.write_bytes(b"fake_video_data")
-
-        mock_build.return_value = mock_youtube_service
-
-        mock_credentials = MagicMock(spec=Credentials)
-        mock_credentials.valid = True
-        mock_credentials.to_json.return_value = '{"token": "fake_token"}'
-
-        mock_flow_instance = MagicMock()
-        mock_flow_instance.run_local_server = MagicMock(return_value=mock_credentials)
-        mock_flow_class.from_client_secrets_file.return_value = mock_flow_instance
-
-        secrets_path_str = str(secrets_file)
-        token_file = temp_dir / ".tokens" / "test_token.json"
-        token_file.parent.mkdir(exist_ok=True)
-        token_file.write_text(
-            '{"token": "fake_token", "refresh_token": "fake_refresh", "client_id": "test", "client_secret": "secret", "token_uri": "https://oauth2.googleapis.com/token"}'
-        )
+        """Test a quota 403 on a small video is re-raised, not swallowed."""
+        set_upload_result(mock_youtube_service, forbidden_upload_error())
+
+        video_data = {
+            "video_path": video_file,
+            "title": "Test Video",
+            "description": "Test Description",
+            "categoryId": 24,
+            "delay": 0,
+            "last_upload": None,
+        }
+
+        with pytest.raises(ResumableUploadError):
+            authed_uploader.upload(video_data)
+
+        insert = mock_youtube_service.videos.return_value.insert
+        assert insert.call_args.kwargs["media_body"].resumable()
+
+    def test_upload_in_chunks(self, authed_uploader, mock_youtube_service, video_file):
+        """Test the upload loops over chunks until the final response arrives."""
+        request = mock_youtube_service.videos.return_value.insert.return_value
+        progress = MagicMock()
+        progress.progress.return_value = 0.5
+        request.next_chunk.side_effect = [
+            (progress, None),
+            (None, {"id": "chunked_video_id"}),
+        ]
+
+        video_url, _ = authed_uploader.upload({"video_path": video_file})
+
+        assert video_url == "https://www.youtube.com/watch?v=chunked_video_id"
+        assert request.next_chunk.call_count == 2
+
+    def test_upload_many_chains_schedule(
+        self, authed_uploader, mock_youtube_service, video_file
+    ):
+        """Test batch uploads share the client and schedule after each other."""
+        jobs = [{"video_path": video_file, "delay": 2} for _ in range(3)]
 
-        def path_exists_token(self):
-            path_str = str(self)
-            import os
-
-            if path_str == secrets_path_str:
-                return os.path.exists(secrets_path_str)
-            if "token" in path_str:
-                return (
-                    os.path.exists(path_str)
-                    if os.path.exists(os.path.dirname(path_str))
-                    else True
-                )
-            return False
-
-        with (
-            patch.object(Path, "exists", path_exists_token),
-            patch("src.youtube.uploader.Credentials") as mock_creds_class,
-        ):
-            mock_creds_class.from_authorized_user_file.return_value = mock_credentials
-            uploader = Uploader(name="test", auth_token=secrets_path_str)
-            uploader.service = mock_youtube_service
-
-            from unittest.mock import Mock
-
-            mock_resp = Mock()
-            mock_resp.status = 403
-            mock_resp.reason = "Forbidden"
-            error = ResumableUploadError(mock_resp, b"Forbidden")
-            mock_youtube_service.videos.return_value.insert.return_value.execute.side_effect = error
-
-            video_data = {
-                "video_path": video_file,
-                "title": "Test Video",
-                "description": "Test Description",
-                "categoryId": 24,
-                "delay": 0,
-                "last_upload": None,
-            }
+        results = authed_uploader.upload_many(jobs)
 
-            with pytest.raises(ResumableUploadError):
-                uploader.upload(video_data)
+        assert len(results) == 3
+        assert mock_youtube_service.videos.return_value.insert.call_count == 3
+        first, second, third = (scheduled for _, scheduled in results)
+        assert second - first == datetime.timedelta(hours=2)
+        assert third - second == datetime.timedelta(hours=2)
 
-    @patch("src.youtube.uploader.InstalledAppFlow")
-    @patch("src.youtube.uploader.build")
-    def test_authenticate_refresh_error(self, mock_build, mock_flow_class, temp_dir):
+    def test_authenticate_refresh_error(self, temp_dir, oauth_patches):
         """Test authentication with refresh error."""
-        secrets_file = temp_dir / "secrets.json"
-        secrets_file.write_text(
-            '{"installed": {"client_id": "test", "client_secret": "secret", "auth_uri": "https://accounts.google.com/o/oauth2/auth", "token_uri": "https://oauth2.googleapis.com/token"}}'
+        mock_credentials = MagicMock(spec=Credentials)
+        mock_credentials.valid = False
+        mock_credentials.expired = True
+        mock_credentials.refresh_token = (
+            "token"  # Has refresh token, so will try to refresh
         )
-
-        with (
-            patch("src.youtube.uploader.Credentials") as mock_creds_class,
-            patch("src.youtube.uploader.Request") as mock_request,
-        ):
-            mock_credentials = MagicMock(spec=Credentials)
-            mock_credentials.valid = False
-            mock_credentials.expired = True
-            mock_credentials.refresh_token = (
-                "token"  # Has refresh token, so will try to refresh
-            )
-            mock_credentials.to_json.return_value = '{"token": "fake_token"}'
-
-            # Track refresh calls
-            refresh_call_count = [0]
-
-            def refresh_side_effect(*args, **kwargs):
-                refresh_call_count[0] += 1
-                if refresh_call_count[0] == 1:
-                    # First refresh attempt fails
-                    raise RefreshError("Token expired")
-
-            mock_credentials.refresh = MagicMock(side_effect=refresh_side_effect)
-
-            def from_authorized_user_file_side_effect(*args, **kwargs):
-                return mock_credentials
-
-            mock_creds_class.from_authorized_user_file = MagicMock(
-                side_effect=from_authorized_user_file_side_effect
-            )
-
-            mock_new_creds = MagicMock()
-            mock_new_creds.valid = True
-            mock_new_creds.to_json.return_value = '{"token": "fake_token"}'
-            mock_flow_instance = MagicMock()
-            mock_flow_instance.run_local_server = MagicMock(return_value=mock_new_creds)
-            mock_flow_class.from_client_secrets_file.return_value = mock_flow_instance
-
-            def build_side_effect(*args, **kwargs):
-                return MagicMock()
-
-            mock_build.side_effect = build_side_effect
-
-            token_file = temp_dir / ".tokens" / "test_token.json"
-            token_file.parent.mkdir(exist_ok=True)
-            token_file.write_text(
-                '{"token": "fake_token", "refresh_token": "fake_refresh", "client_id": "test", "client_secret": "secret", "token_uri": "https://oauth2.googleapis.com/token"}'
-            )
-
-            secrets_path_str = str(secrets_file)
-
-            def path_exists_mock(self):
-                path_str = str(self)
-                import os
-
-                if path_str == secrets_path_str:
-                    return os.path.exists(secrets_path_str)
-                if path_str.endswith("token.json"):
-                    return (
-                        os.path.exists(path_str)
-                        if os.path.exists(os.path.dirname(path_str))
-                        else False
-                    )
-                return False
-
-            with patch.object(Path, "exists", path_exists_mock):
-                uploader = Uploader(name="test", auth_token=secrets_path_str)
-                assert uploader is not None
-                # Verify that refresh was called
-                assert refresh_call_count[0] > 0
+        mock_credentials.to_json.return_value = '{"token": "fake_token"}'
+        # First refresh attempt fails, the retry succeeds
+        mock_credentials.refresh.side_effect = [RefreshError("Token expired"), None]
+        credentials_class = oauth_patches.credentials_class
+        credentials_class.from_authorized_user_file.return_value = mock_credentials
+
+        with patch.object(Path, "unlink") as mock_unlink:
+            uploader = Uploader(name="test", auth_token=str(temp_dir / "secrets.json"))
+
+        # The stale token is dropped before retrying
+        mock_unlink.assert_called_once()
+        assert uploader is not None
+        # Verify that refresh was retried after the failure
+        assert mock_credentials.refresh.call_count == 2
+        # The refreshed token lands under tmp_path, never in the working tree
+        token_file = temp_dir / ".tokens" / "test_token.json"
+        assert token_file.read_text(encoding="utf-8") == '{"token": "fake_token"}'
@@ -2,9 +2,10 @@
 Tests for preset.YmlHandler class.
 """
 
-import yaml
 from src.preset import YmlHandler
 
+EXISTING_PRESET_YAML = "NAME: test\nVALUE: 42\n"
+
 
 class TestYmlHandler:
     """Test suite for YmlHandler."""
@@ -12,9 +13,7 @@ class TestYmlHandler:
     def test_init_with_existing_file(self, temp_dir):
         """Test initializing YmlHandler with an existing file."""
         preset_path = temp_dir / "test_preset.yml"
-        data = {"NAME": "test", "VALUE": 42}
-        with preset_path.open("w", encoding="utf-8") as f:
-            yaml.safe_dump(data, f)
+        preset_path.write_text(EXISTING_PRESET_YAML, encoding="utf-8")
 
         handler = YmlHandler(preset_path)
         assert handler.path == preset_path
@@ -39,16 +38,16 @@ class TestYmlHandler:
         assert preset_handler.get("NAME") == "test_channel"
         assert preset_handler.get("NONEXISTENT") is None
 
-    def test_set_value(self, preset_handler, temp_preset_file):
+    def test_set_value(self, preset_handler, writable_preset_file):
         """Test setting a value."""
         preset_handler.set("NEW_KEY", "new_value")
         assert preset_handler.get("NEW_KEY") == "new_value"
 
         # Verify it's persisted to file
-        handler2 = YmlHandler(temp_preset_file)
+        handler2 = YmlHandler(writable_preset_file)
         assert handler2.get("NEW_KEY") == "new_value"
 
-    def test_delete_key(self, preset_handler, temp_preset_file):
+    def test_delete_key(self, preset_handler, writable_preset_file):
         """Test deleting a key."""
         preset_handler.set("TO_DELETE", "value")
         assert preset_handler.get("TO_DELETE") == "value"
@@ -57,17 +56,17 @@ class TestYmlHandler:
         assert preset_handler.get("TO_DELETE") is None
 
         # Verify it's persisted
-        handler2 = YmlHandler(temp_preset_file)
+        handler2 = YmlHandler(writable_preset_file)
         assert handler2.get("TO_DELETE") is None
 
-    def test_update_multiple_keys(self, preset_handler, temp_preset_file):
+    def test_update_multiple_keys(self, preset_handler, writable_preset_file):
         """Test updating multiple keys at once."""
         preset_handler.update({"KEY1": "value1", "KEY2": "value2"})
         assert preset_handler.get("KEY1") == "value1"
         assert preset_handler.get("KEY2") == "value2"
 
         # Verify persistence
-        handler2 = YmlHandler(temp_preset_file)
+        handler2 = YmlHandler(writable_preset_file)
         assert handler2.get("KEY1") == "value1"
         assert handler2.get("KEY2") == "value2"
 